@@ -0,0 +1,101 @@
+"""Compact tool payloads before they are placed in the synthesizer prompt.
+
+Pretty-printed JSON of every tool result wastes input tokens on braces,
+quotes, repeated keys and long article bodies. Each result is rendered as
+plain text instead, with lists of records as pipe-separated tables, noisy
+fields dropped, article snippets shortened, floats rounded and each tool held
+to a token budget.
+"""
+import json
+import numbers
+import os
+from typing import Any, Dict, List
+
+from agent.state import ToolResult
+
+TOOL_TOKEN_BUDGET = int(os.getenv("TOOL_TOKEN_BUDGET", "600"))
+SNIPPET_CHARS = int(os.getenv("SNIPPET_CHARS", "280"))
+
+# Budgets for tools whose output is worth more (or less) than the default
+TOOL_TOKEN_BUDGETS = {
+    "search_f1_news": 900,
+    "get_race_weather": 400,
+    "get_circuit_info": 200,
+    "get_grid_form": 500,
+    "get_race_pace": 450,
+    "get_qualifying_pace": 450,
+}
+
+# Fields that add tokens without helping the briefing
+PRUNED_FIELDS = {
+    "search_f1_news": {"url", "score", "query", "count"},
+    "get_race_weather": {"feels_like_c"},
+}
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral):
+        return f"{value:.1f}".rstrip("0").rstrip(".")
+    if isinstance(value, str) and len(value) > SNIPPET_CHARS:
+        return value[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+    if value is None:
+        return "-"
+    return " ".join(str(value).split())
+
+def _table(rows: List[Dict[str, Any]], pruned: set) -> List[str]:
+    columns = [c for c in rows[0] if c not in pruned]
+    for row in rows[1:]:
+        columns += [c for c in row if c not in columns and c not in pruned]
+    columns = [c for c in columns if any(row.get(c) not in ("", None) for row in rows)]
+    lines = [" | ".join(columns)]
+    lines += [" | ".join(_scalar(row.get(c)).replace("|", "/") for c in columns) for row in rows]
+    return lines
+
+def _render(data: Any, pruned: set, indent: str = "") -> List[str]:
+    lines = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in pruned or value in ("", [], {}):
+                continue
+            if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+                lines.append(f"{indent}{key}:")
+                lines += [indent + "  " + line for line in _table(value, pruned)]
+            elif isinstance(value, (dict, list)):
+                lines.append(f"{indent}{key}:")
+                lines += _render(value, pruned, indent + "  ")
+            else:
+                lines.append(f"{indent}{key}: {_scalar(value)}")
+    elif isinstance(data, list):
+        lines.append(indent + ", ".join(_scalar(v) for v in data))
+    else:
+        lines.append(indent + _scalar(data))
+    return lines
+
+def compact_tool_result(tool_result: ToolResult) -> str:
+    """Render one tool result as compact text within its token budget."""
+    name = tool_result["tool_name"]
+    header = f"### {name} ({'ok' if tool_result['success'] else 'failed'})"
+    if not tool_result["success"]:
+        return f"{header}\nerror: {_scalar(tool_result['data'].get('error', 'unknown error'))}"
+    
+    try:
+        lines = _render(tool_result["data"], PRUNED_FIELDS.get(name, set()))
+    except Exception:
+        lines = [json.dumps(tool_result["data"], default=str)]
+    
+    budget = TOOL_TOKEN_BUDGETS.get(name, TOOL_TOKEN_BUDGET) * 4
+    kept, used = [], len(header)
+    for line in lines:
+        if used + len(line) + 1 > budget:
+            kept.append(f"… ({len(lines) - len(kept)} more lines omitted)")
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join([header] + kept)
+
+def compact_tool_results(tool_results: List[ToolResult]) -> str:
+    """Compact text for every tool result, in order."""
+    return "\n\n".join(compact_tool_result(tr) for tr in tool_results)
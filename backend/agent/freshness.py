@@ -0,0 +1,41 @@
+"""How long each tool's data stays current.
+
+Weather forecasts and news change within the hour during a race weekend,
+standings and form only when a session finishes, and track facts, past
+winners and last year's pace not at all. A refresh of a cached briefing
+re-runs only the tools whose results are older than their maximum age.
+"""
+import os
+import time
+from typing import Dict, Optional
+
+from agent.state import ToolResult
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+DEFAULT_MAX_AGE = float(os.getenv("TOOL_MAX_AGE_SECONDS", str(6 * HOUR)))
+
+# Maximum age in seconds of each tool's data
+TOOL_MAX_AGE: Dict[str, float] = {
+    "get_race_weather": float(os.getenv("WEATHER_MAX_AGE_SECONDS", str(HOUR))),
+    "search_f1_news": float(os.getenv("NEWS_MAX_AGE_SECONDS", str(HOUR))),
+    "get_season_standings": 6 * HOUR,
+    "get_grid_form": 6 * HOUR,
+    "get_track_info": 7 * DAY,
+    "get_circuit_info": 7 * DAY,
+    "get_circuit_winners": 7 * DAY,
+    "get_recent_race_results": 7 * DAY,
+    "get_race_pace": 7 * DAY,
+    "get_qualifying_pace": 7 * DAY,
+}
+
+def max_age(tool_name: str) -> float:
+    return TOOL_MAX_AGE.get(tool_name, DEFAULT_MAX_AGE)
+
+def is_stale(tool_result: ToolResult, now: Optional[float] = None) -> bool:
+    """Whether a result must be fetched again: failed, undated or past its maximum age."""
+    fetched_at = tool_result.get("fetched_at")
+    if not tool_result["success"] or fetched_at is None:
+        return True
+    return (now or time.time()) - fetched_at >= max_age(tool_result["tool_name"])
@@ -1,13 +1,28 @@
+import asyncio
+import functools
 import json
 import os
-from typing import Dict, Any
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from agent.state import AgentState, RaceInfo, ToolResult
-from agent.prompts import PLANNER_PROMPT, SYNTHESIZER_PROMPT
-from tools.fastf1_tools import get_track_info, get_driver_form, get_recent_race_results
+from agent.prompts import PLANNER_PROMPT, REFRESH_PROMPT, SYNTHESIZER_PROMPT
+from agent.compaction import compact_tool_results, estimate_tokens
+from agent.freshness import is_stale
+from agent.resolver import DEFAULT_TASKS, RESOLVER_MIN_CONFIDENCE, resolve_query
+from tools.fastf1_tools import (
+    get_track_info,
+    get_grid_form,
+    get_recent_race_results,
+    get_race_pace,
+    get_qualifying_pace
+)
 from tools.f1_data_tools import (
     get_season_standings,
     get_circuit_winners,
@@ -15,6 +30,8 @@ from tools.f1_data_tools import (
 )
 from tools.search_tools import search_f1_news
 from tools.weather_tools import get_race_weather
+from tools.executor import fastf1_executor
+from tools import metrics
 
 all_tools = [
     get_track_info,
@@ -23,29 +40,98 @@ all_tools = [
     get_circuit_info,
     search_f1_news,
     get_race_weather,
-    get_driver_form,
-    get_recent_race_results
+    get_grid_form,
+    get_recent_race_results,
+    get_race_pace,
+    get_qualifying_pace
 ]
 
-llm = ChatAnthropic(
-    model="claude-sonnet-4-20250514",
-    api_key=os.getenv("ANTHROPIC_API_KEY"),
-    temperature=0.7
-)
+tool_map = {tool.name: tool for tool in all_tools}
+
+_llm: Optional[ChatAnthropic] = None
+_agents: Optional[Tuple[Any, Any]] = None
+_build_lock = threading.Lock()
+
+def get_llm() -> ChatAnthropic:
+    """Shared chat model, constructed on first use rather than at import."""
+    global _llm
+    with _build_lock:
+        if _llm is None:
+            _llm = ChatAnthropic(
+                model="claude-sonnet-4-20250514",
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                temperature=0.7,
+                streaming=True
+            )
+        return _llm
 
-def planner_node(state: AgentState) -> Dict[str, Any]:
-    """Parse user query and create execution plan."""
+def set_llm(llm: Any) -> None:
+    """Replace the chat model used by the planner and synthesizer (e.g. with a fake for benchmarks)."""
+    global _llm
+    with _build_lock:
+        _llm = llm
+
+def message_text(content: Any) -> str:
+    """Plain text of a message or chunk content, which may be a list of blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content or []
+    )
+
+def timed_node(name: str):
+    """Record a node's wall time as a metric and under ``timings`` in the state."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def node(state: AgentState) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                update = await fn(state)
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.NODE_SECONDS.observe(elapsed, node=name)
+            return {**update, "timings": {f"{name}_ms": round(elapsed * 1000, 1)}}
+        return node
+    return decorate
+
+@timed_node("planner")
+async def planner_node(state: AgentState) -> Dict[str, Any]:
+    """Parse user query and create execution plan.
+    
+    Queries the local resolver recognizes confidently skip the LLM call.
+    """
     query = state.get("race_query", "")
     
+    race_info, confidence = await fastf1_executor.run(resolve_query, query)
+    if race_info and confidence >= RESOLVER_MIN_CONFIDENCE:
+        print(f"Planner fast path: {race_info['name']} {race_info['year']}")
+        return {
+            "race_info": race_info,
+            "tasks": list(DEFAULT_TASKS),
+            "current_step": "gathering"
+        }
+    
+    # A partial local match is a good guess: fetch its data while the LLM plans
+    speculation_id = None
+    if SPECULATIVE_TOOLS and race_info and confidence >= SPECULATIVE_MIN_CONFIDENCE:
+        speculation_id = start_speculation(race_info)
+    
     messages = [
         SystemMessage(content=PLANNER_PROMPT.format(query=query)),
         HumanMessage(content=query)
     ]
     
-    response = llm.invoke(messages)
+    try:
+        with metrics.LLM_SECONDS.time(node="planner"):
+            response = await get_llm().ainvoke(messages)
+    except BaseException:
+        discard_speculation(speculation_id)
+        raise
+    metrics.record_tokens("planner", getattr(response, "usage_metadata", None))
     
     try:
-        content = response.content
+        content = message_text(response.content)
         if "```json" in content:
             content = content.split("```json")[1].split("```")[0]
         elif "```" in content:
@@ -64,9 +150,11 @@ def planner_node(state: AgentState) -> Dict[str, Any]:
         return {
             "race_info": race_info,
             "tasks": plan["tasks"],
+            "speculation_id": speculation_id,
             "current_step": "gathering"
         }
     except Exception as e:
+        discard_speculation(speculation_id)
         return {
             "race_info": None,
             "tasks": [],
@@ -74,107 +162,378 @@ def planner_node(state: AgentState) -> Dict[str, Any]:
             "briefing": f"Failed to parse race query: {str(e)}"
         }
 
-def tool_executor_node(state: AgentState) -> Dict[str, Any]:
-    """Execute planned tools and gather data."""
+COUNTRY_CODE_MAP = {
+    "Monaco": "MC", "United Kingdom": "GB", "Italy": "IT", "Belgium": "BE",
+    "Japan": "JP", "Singapore": "SG", "United States": "US", "Bahrain": "BH",
+    "Saudi Arabia": "SA", "Australia": "AU", "Spain": "ES", "Canada": "CA",
+    "Austria": "AT", "Hungary": "HU", "Netherlands": "NL", "Mexico": "MX",
+    "Brazil": "BR", "UAE": "AE", "United Arab Emirates": "AE", "Great Britain": "GB",
+    "Azerbaijan": "AZ", "Qatar": "QA", "China": "CN", "Emilia Romagna": "IT"
+}
+
+# On refresh, send the LLM the previous briefing plus only the changed tool
+# results instead of re-synthesizing from all of them
+REFRESH_DIFF = os.getenv("REFRESH_DIFF", "true").lower() == "true"
+
+# Per-tool timeout and overall deadline for the data-gathering phase (seconds)
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT_SECONDS", "45"))
+TOOL_DEADLINE = float(os.getenv("TOOL_DEADLINE_SECONDS", "60"))
+
+# Speculative execution: when the resolver only partially matches a query,
+# DEFAULT_TASKS for its guess start while the LLM planner runs
+SPECULATIVE_TOOLS = os.getenv("SPECULATIVE_TOOLS", "true").lower() == "true"
+SPECULATIVE_MIN_CONFIDENCE = float(os.getenv("SPECULATIVE_MIN_CONFIDENCE", "0.5"))
+# Unclaimed speculative calls (e.g. the briefing was served from cache) are cancelled after this
+SPECULATION_TTL = float(os.getenv("SPECULATION_TTL_SECONDS", "120"))
+
+# Tools doing blocking FastF1 work run on the bounded FastF1 executor
+FASTF1_TOOLS = {
+    "get_track_info",
+    "get_season_standings",
+    "get_circuit_winners",
+    "get_circuit_info",
+    "get_grid_form",
+    "get_recent_race_results",
+    "get_race_pace",
+    "get_qualifying_pace"
+}
+
+def build_tool_args(task_name: str, race_info: RaceInfo) -> Optional[Dict[str, Any]]:
+    """Map a planned task to the arguments its tool is invoked with."""
+    if task_name == "get_track_info":
+        return {"circuit_name": race_info["name"], "year": race_info["year"]}
+    elif task_name == "get_season_standings":
+        return {"year": race_info["year"]}
+    elif task_name == "get_circuit_winners":
+        return {"circuit_name": race_info["name"], "years_back": 3}
+    elif task_name == "get_circuit_info":
+        return {"circuit_name": race_info["name"], "year": race_info["year"]}
+    elif task_name == "search_f1_news":
+        return {"query": f"{race_info['name']} {race_info['year']}", "max_results": 5}
+    elif task_name == "get_race_weather":
+        country_code = COUNTRY_CODE_MAP.get(race_info["country"], "US")
+        return {"city": race_info["location"], "country_code": country_code}
+    elif task_name == "get_grid_form":
+        return {"year": race_info["year"], "num_races": 5, "top_n": 10}
+    elif task_name == "get_recent_race_results":
+        return {"event_name": race_info["name"], "year": race_info["year"] - 1}
+    elif task_name in ("get_race_pace", "get_qualifying_pace"):
+        return {"event_name": race_info["name"], "year": race_info["year"] - 1}
+    return None
+
+async def run_tool(task_name: str, race_info: RaceInfo) -> ToolResult:
+    """Invoke a single planned tool and wrap its output as a ToolResult.
+    
+    Each tool gets TOOL_TIMEOUT seconds; for FastF1 tools the clock starts
+    once an executor worker picks the job up.
+    """
+    if task_name not in tool_map:
+        return ToolResult(
+            tool_name=task_name,
+            success=False,
+            data={"error": f"Unknown tool: {task_name}"}
+        )
+    
+    args = build_tool_args(task_name, race_info)
+    if args is None:
+        return ToolResult(
+            tool_name=task_name,
+            success=False,
+            data={"error": f"No handler for tool: {task_name}"}
+        )
+    
+    return await invoke_tool(task_name, args)
+
+async def invoke_tool(task_name: str, args: Dict[str, Any]) -> ToolResult:
+    """Call a known tool with prepared arguments, timing it against TOOL_TIMEOUT.
+    
+    Separate from run_tool so callers that share one call between several
+    plans (see api.batch) can invoke it directly.
+    """
+    tool = tool_map[task_name]
+    started = time.perf_counter()
+    status = "error"
+    try:
+        if task_name in FASTF1_TOOLS:
+            result = await fastf1_executor.run(tool.invoke, args, timeout=TOOL_TIMEOUT)
+        else:
+            result = await asyncio.wait_for(tool.ainvoke(args), TOOL_TIMEOUT)
+        if "error" not in result:
+            status = "ok"
+        tool_result = ToolResult(
+            tool_name=task_name,
+            success="error" not in result,
+            data=result
+        )
+    except asyncio.TimeoutError:
+        status = "timeout"
+        tool_result = ToolResult(
+            tool_name=task_name,
+            success=False,
+            data={"error": f"Tool timed out after {TOOL_TIMEOUT:.0f}s"}
+        )
+    except Exception as e:
+        tool_result = ToolResult(
+            tool_name=task_name,
+            success=False,
+            data={"error": str(e)}
+        )
+    
+    elapsed = time.perf_counter() - started
+    metrics.TOOL_SECONDS.observe(elapsed, tool=task_name, status=status)
+    tool_result["elapsed_ms"] = round(elapsed * 1000, 1)
+    tool_result["fetched_at"] = time.time()
+    return tool_result
+
+def deadline_result(task_name: str, elapsed: float) -> ToolResult:
+    """Result for a tool that was still running when its phase deadline passed."""
+    metrics.TOOL_SECONDS.observe(elapsed, tool=task_name, status="timeout")
+    return ToolResult(
+        tool_name=task_name,
+        success=False,
+        data={"error": f"Tool timed out after {elapsed:.1f}s"},
+        elapsed_ms=round(elapsed * 1000, 1)
+    )
+
+ToolCallKey = Tuple[str, str]
+
+_speculations: Dict[str, Dict[ToolCallKey, "asyncio.Future[ToolResult]"]] = {}
+
+def tool_call_key(task_name: str, args: Dict[str, Any]) -> ToolCallKey:
+    """Identity of a tool call: the same tool with the same arguments."""
+    return task_name, json.dumps(args, sort_keys=True, default=str)
+
+def start_speculation(race_info: RaceInfo) -> str:
+    """Start DEFAULT_TASKS for a guessed race and return the id to claim them by."""
+    speculation_id = uuid.uuid4().hex
+    calls = {}
+    for task_name in DEFAULT_TASKS:
+        args = build_tool_args(task_name, race_info)
+        if task_name in tool_map and args is not None:
+            calls[tool_call_key(task_name, args)] = asyncio.ensure_future(invoke_tool(task_name, args))
+    _speculations[speculation_id] = calls
+    asyncio.get_running_loop().call_later(SPECULATION_TTL, discard_speculation, speculation_id)
+    print(f"Speculating {len(calls)} tools for {race_info['name']} {race_info['year']}")
+    return speculation_id
+
+def discard_speculation(speculation_id: Optional[str]) -> None:
+    """Cancel every unclaimed call of a speculation."""
+    calls = _speculations.pop(speculation_id, None) if speculation_id else None
+    for future in (calls or {}).values():
+        future.cancel()
+    if calls:
+        metrics.SPECULATIVE_CALLS.inc(len(calls), result="discarded")
+
+def claim_speculation(speculation_id: Optional[str]) -> Dict[ToolCallKey, "asyncio.Future[ToolResult]"]:
+    """Take ownership of a speculation's calls; the caller reuses or cancels each one."""
+    if not speculation_id:
+        return {}
+    return _speculations.pop(speculation_id, None) or {}
+
+def reconcile_speculation(speculation_id: Optional[str], race_info: RaceInfo,
+                          tasks: List[str]) -> Dict[str, "asyncio.Future[ToolResult]"]:
+    """Speculative calls that match the final plan, by task name; the rest are cancelled.
+    
+    A call matches when the plan has the same tool with the same arguments,
+    so a speculation on the wrong race is never reused.
+    """
+    calls = claim_speculation(speculation_id)
+    if not calls:
+        return {}
+    
+    wanted = {}
+    for task_name in tasks:
+        args = build_tool_args(task_name, race_info) if task_name in tool_map else None
+        if args is not None:
+            wanted.setdefault(tool_call_key(task_name, args), task_name)
+    
+    reused = {}
+    for key, future in calls.items():
+        if key in wanted and not future.cancelled():
+            reused[wanted[key]] = future
+        else:
+            future.cancel()
+    metrics.SPECULATIVE_CALLS.inc(len(reused), result="reused")
+    metrics.SPECULATIVE_CALLS.inc(len(calls) - len(reused), result="discarded")
+    return reused
+
+async def claimed_result(future: "asyncio.Future[ToolResult]") -> ToolResult:
+    """Await a reused speculative call, marking its result as speculative."""
+    result = dict(await future)
+    result["speculative"] = True
+    return result
+
+def stream_writer():
+    """LangGraph custom stream writer, or a no-op outside a streamed graph run."""
+    try:
+        return get_stream_writer()
+    except Exception:
+        return lambda _: None
+
+@timed_node("tool_executor")
+async def tool_executor_node(state: AgentState) -> Dict[str, Any]:
+    """Execute planned tools concurrently and gather data.
+    
+    All tools start at once, so the phase takes roughly as long as the
+    slowest tool. Calls the planner already started speculatively are
+    reused rather than repeated. Each completion is written to the custom
+    stream as it happens; the returned results keep the planned order. Tools
+    still running at TOOL_DEADLINE are cancelled.
+    
+    When the state already holds results (a refresh of a cached briefing),
+    only the stale ones are fetched again; ``refreshed_tools`` lists the
+    tools whose data changed.
+    """
     race_info = state.get("race_info")
     tasks = state.get("tasks", [])
     
     if not race_info:
         return {"current_step": "error", "briefing": "No race information available"}
     
-    tool_results = []
-    tool_map = {tool.name: tool for tool in all_tools}
+    writer = stream_writer()
+    started = time.monotonic()
     
-    for task_name in tasks:
-        if task_name not in tool_map:
-            tool_results.append(ToolResult(
-                tool_name=task_name,
-                success=False,
-                data={"error": f"Unknown tool: {task_name}"}
-            ))
-            continue
-        
-        tool = tool_map[task_name]
-        
+    previous = {tr["tool_name"]: tr for tr in state.get("tool_results") or []}
+    now = time.time()
+    fresh = {name: tr for name, tr in previous.items() if name in tasks and not is_stale(tr, now)}
+    for tool_result in fresh.values():
+        writer({"tool_result": tool_result})
+    
+    tasks_to_run = [task_name for task_name in tasks if task_name not in fresh]
+    speculative = reconcile_speculation(state.get("speculation_id"), race_info, tasks_to_run)
+    
+    async def run_and_report(task_name: str) -> ToolResult:
+        future = speculative.pop(task_name, None)
+        if future is not None:
+            result = await claimed_result(future)
+        else:
+            result = await run_tool(task_name, race_info)
+        writer({"tool_result": result})
+        return result
+    
+    pending = [asyncio.ensure_future(run_and_report(task_name)) for task_name in tasks_to_run]
+    if pending:
         try:
-            if task_name == "get_track_info":
-                result = tool.invoke({"circuit_name": race_info["name"], "year": race_info["year"]})
-            elif task_name == "get_season_standings":
-                result = tool.invoke({"year": race_info["year"]})
-            elif task_name == "get_circuit_winners":
-                result = tool.invoke({"circuit_name": race_info["name"], "years_back": 3})
-            elif task_name == "get_circuit_info":
-                result = tool.invoke({"circuit_name": race_info["name"], "year": race_info["year"]})
-            elif task_name == "search_f1_news":
-                result = tool.invoke({"query": f"{race_info['name']} {race_info['year']}", "max_results": 5})
-            elif task_name == "get_race_weather":
-                country_code_map = {
-                    "Monaco": "MC", "United Kingdom": "GB", "Italy": "IT", "Belgium": "BE",
-                    "Japan": "JP", "Singapore": "SG", "United States": "US", "Bahrain": "BH",
-                    "Saudi Arabia": "SA", "Australia": "AU", "Spain": "ES", "Canada": "CA",
-                    "Austria": "AT", "Hungary": "HU", "Netherlands": "NL", "Mexico": "MX",
-                    "Brazil": "BR", "UAE": "AE"
-                }
-                country_code = country_code_map.get(race_info["country"], "US")
-                result = tool.invoke({"city": race_info["location"], "country_code": country_code})
-            elif task_name == "get_driver_form":
-                result = tool.invoke({"driver_code": "VER", "year": race_info["year"], "num_races": 5})
-            elif task_name == "get_recent_race_results":
-                result = tool.invoke({"event_name": race_info["name"], "year": race_info["year"] - 1})
-            else:
-                result = {"error": f"No handler for tool: {task_name}"}
-            
-            tool_results.append(ToolResult(
-                tool_name=task_name,
-                success="error" not in result,
-                data=result
-            ))
-        except Exception as e:
-            tool_results.append(ToolResult(
-                tool_name=task_name,
-                success=False,
-                data={"error": str(e)}
-            ))
+            await asyncio.wait(pending, timeout=TOOL_DEADLINE)
+        finally:
+            for future in pending + list(speculative.values()):
+                future.cancel()
+            # cancel() only requests cancellation; let the tasks actually finish
+            await asyncio.gather(*pending, return_exceptions=True)
     
+    fetched = {}
+    for task_name, future in zip(tasks_to_run, pending):
+        if not future.done() or future.cancelled() or isinstance(future.exception(), asyncio.CancelledError):
+            fetched[task_name] = deadline_result(task_name, time.monotonic() - started)
+        else:
+            fetched[task_name] = future.result()
+    
+    refreshed = [
+        task_name for task_name, result in fetched.items()
+        if task_name not in previous or previous[task_name]["data"] != result["data"]
+    ]
     return {
-        "tool_results": tool_results,
-        "current_step": "synthesizing"
+        "tool_results": [fresh.get(task_name) or fetched[task_name] for task_name in tasks],
+        "refreshed_tools": refreshed,
+        "current_step": "synthesizing" if refreshed or not state.get("briefing") else "complete"
     }
 
-def synthesizer_node(state: AgentState) -> Dict[str, Any]:
-    """Synthesize tool results into final briefing."""
+def after_tools(state: AgentState) -> str:
+    """Skip the synthesizer when a refresh found nothing that changed."""
+    return END if state.get("current_step") == "complete" else "synthesizer"
+
+@timed_node("synthesizer")
+async def synthesizer_node(state: AgentState) -> Dict[str, Any]:
+    """Synthesize tool results into final briefing.
+    
+    The LLM streams, so graphs run with stream_mode="messages" emit the
+    briefing token by token while this node is still running.
+    """
     tool_results = state.get("tool_results", [])
     race_info = state.get("race_info")
     
     if not tool_results:
         return {"briefing": "No data available to generate briefing", "current_step": "complete"}
     
-    results_text = json.dumps([
-        {"tool": tr["tool_name"], "success": tr["success"], "data": tr["data"]}
-        for tr in tool_results
-    ], indent=2)
+    # A refresh can send just the changed data along with the previous briefing
+    previous_briefing = state.get("briefing")
+    refreshed = set(state.get("refreshed_tools") or [])
+    diff = bool(REFRESH_DIFF and previous_briefing and refreshed)
+    if diff:
+        tool_results = [tr for tr in tool_results if tr["tool_name"] in refreshed]
     
-    messages = [
-        SystemMessage(content=SYNTHESIZER_PROMPT.format(tool_results=results_text)),
-        HumanMessage(content=f"Generate briefing for {race_info['name']} {race_info['year']}")
-    ]
+    results_text = compact_tool_results(tool_results)
+    raw_tokens = estimate_tokens(json.dumps([tr["data"] for tr in tool_results], indent=2, default=str))
+    print(f"Synthesizer input for {race_info['name']} {race_info['year']}: "
+          f"~{estimate_tokens(results_text)} tool tokens (uncompacted ~{raw_tokens})")
     
-    response = llm.invoke(messages)
+    if diff:
+        messages = [
+            SystemMessage(content=REFRESH_PROMPT.format(briefing=previous_briefing, tool_results=results_text)),
+            HumanMessage(content=f"Update briefing for {race_info['name']} {race_info['year']}")
+        ]
+    else:
+        messages = [
+            SystemMessage(content=SYNTHESIZER_PROMPT.format(tool_results=results_text)),
+            HumanMessage(content=f"Generate briefing for {race_info['name']} {race_info['year']}")
+        ]
+    
+    parts = []
+    with metrics.LLM_SECONDS.time(node="synthesizer"):
+        async for chunk in get_llm().astream(messages):
+            parts.append(message_text(chunk.content))
+            # Anthropic reports input tokens on the first chunk and output tokens on the last
+            metrics.record_tokens("synthesizer", getattr(chunk, "usage_metadata", None))
     
     return {
-        "briefing": response.content,
+        "briefing": "".join(parts),
         "current_step": "complete"
     }
 
-workflow = StateGraph(AgentState)
-
-workflow.add_node("planner", planner_node)
-workflow.add_node("tool_executor", tool_executor_node)
-workflow.add_node("synthesizer", synthesizer_node)
+def build_agents() -> Tuple[Any, Any]:
+    """Compile the full briefing graph and the execution-only graph.
+    
+    The execution graph (data gathering and synthesis only) is for callers
+    that run the planner themselves, and for refreshing cached briefings.
+    """
+    workflow = StateGraph(AgentState)
+    
+    workflow.add_node("planner", planner_node)
+    workflow.add_node("tool_executor", tool_executor_node)
+    workflow.add_node("synthesizer", synthesizer_node)
+    
+    workflow.set_entry_point("planner")
+    workflow.add_edge("planner", "tool_executor")
+    workflow.add_edge("tool_executor", "synthesizer")
+    workflow.add_edge("synthesizer", END)
+    
+    execution_workflow = StateGraph(AgentState)
+    
+    execution_workflow.add_node("tool_executor", tool_executor_node)
+    execution_workflow.add_node("synthesizer", synthesizer_node)
+    
+    execution_workflow.set_entry_point("tool_executor")
+    execution_workflow.add_conditional_edges("tool_executor", after_tools, ["synthesizer", END])
+    execution_workflow.add_edge("synthesizer", END)
+    
+    return workflow.compile(), execution_workflow.compile()
 
-workflow.set_entry_point("planner")
-workflow.add_edge("planner", "tool_executor")
-workflow.add_edge("tool_executor", "synthesizer")
-workflow.add_edge("synthesizer", END)
+def get_agents() -> Tuple[Any, Any]:
+    """Compiled (agent, execution_agent), built once on first use."""
+    global _agents
+    if _agents is None:
+        agents = build_agents()
+        with _build_lock:
+            if _agents is None:
+                _agents = agents
+    return _agents
 
-agent = workflow.compile()
+def __getattr__(name: str) -> Any:
+    # Keep ``from agent.graph import agent`` working without compiling at import
+    if name == "agent":
+        return get_agents()[0]
+    if name == "execution_agent":
+        return get_agents()[1]
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -37,7 +37,7 @@ Return JSON with this exact structure:
     "location": "Monte Carlo",
     "country": "Monaco"
   }},
-  "tasks": ["get_track_info", "get_season_standings", "get_circuit_winners", "search_f1_news", "get_race_weather"]
+  "tasks": ["get_track_info", "get_season_standings", "get_circuit_winners", "get_grid_form", "search_f1_news", "get_race_weather", "get_race_pace", "get_qualifying_pace"]
 }}
 
 User query: {query}"""
@@ -53,7 +53,7 @@ Key characteristics that define this circuit. What makes it unique? Historical s
 Current standings and what's at stake this weekend. Points gaps, mathematical scenarios.
 
 ## Form Guide
-Who's arriving in form? Who's struggling? Use recent results data to support analysis.
+Who's arriving in form? Who's struggling? Use the grid form table of recent results to support analysis, and last year's long-run pace and tyre degradation at this circuit where available.
 
 ## Key Storylines
 What narratives should fans watch for? News, drama, technical developments.
@@ -62,7 +62,7 @@ What narratives should fans watch for? News, drama, technical developments.
 Forecast and strategic implications. How might weather affect tire strategy?
 
 ## Predictions
-Your informed picks:
+Your informed picks, backed by last year's qualifying gaps and race pace here where available:
 - Pole Position favorites (top 3)
 - Podium prediction
 - Dark horse to watch
@@ -73,3 +73,17 @@ Tool Results:
 {tool_results}
 
 Generate the complete briefing now:"""
+
+REFRESH_PROMPT = """You are an expert F1 analyst updating a race weekend briefing you wrote earlier.
+
+Current briefing:
+{briefing}
+
+Some of the data behind it has been refreshed since it was written. Only the refreshed data is shown below; everything else is unchanged.
+
+Refreshed Tool Results:
+{tool_results}
+
+Rewrite the briefing so it reflects the refreshed data. Revise only what the new data affects (for example Weather Watch for a new forecast, Key Storylines for new news, and any predictions that depend on them) and keep every other section as it is, with the same structure and style.
+
+Generate the complete updated briefing now:"""
@@ -0,0 +1,76 @@
+"""Local race query resolver used as a fast path in front of the LLM planner.
+
+Simple queries such as "Monaco 2025" or "British GP" are resolved against the
+cached FastF1 schedule and its alias index. Anything the resolver is not
+confident about is left to the LLM planner.
+"""
+import os
+import re
+from datetime import datetime
+from typing import Optional, Tuple
+
+from agent.state import RaceInfo
+from tools import schedule_cache
+
+RESOLVER_MIN_CONFIDENCE = float(os.getenv("RESOLVER_MIN_CONFIDENCE", "0.8"))
+
+# Task list the planner returns for a standard briefing (see PLANNER_PROMPT)
+DEFAULT_TASKS = [
+    "get_track_info",
+    "get_season_standings",
+    "get_circuit_winners",
+    "get_grid_form",
+    "search_f1_news",
+    "get_race_weather",
+    "get_race_pace",
+    "get_qualifying_pace"
+]
+
+YEAR_PATTERN = re.compile(r'\b(19[5-9]\d|20\d\d)\b')
+
+# Words that carry no information about which race is meant
+FILLER_WORDS = {
+    "race", "weekend", "briefing", "preview", "the", "for", "a", "an", "of",
+    "season", "please", "give", "me", "tell", "about", "brief", "report"
+}
+
+def extract_year(query: str) -> Tuple[int, str]:
+    """Pull a season year out of the query, defaulting to the current season."""
+    match = YEAR_PATTERN.search(query)
+    if not match:
+        return datetime.now().year, query
+    return int(match.group(1)), query[:match.start()] + " " + query[match.end():]
+
+def resolve_query(query: str) -> Tuple[Optional[RaceInfo], float]:
+    """Resolve a free-text race query to RaceInfo with a confidence score.
+    
+    Confidence is 1.0 when the remaining words exactly match an event name,
+    alias, location or country, lower for partial matches and 0.0 when no
+    event matches.
+    """
+    year, remainder = extract_year(query)
+    words = [w for w in schedule_cache.normalize_name(remainder).split() if w not in FILLER_WORDS]
+    if not words:
+        return None, 0.0
+    
+    try:
+        match = schedule_cache.lookup_event(year, " ".join(words))
+    except Exception as e:
+        print(f"Resolver: schedule lookup failed for {year}: {e}")
+        return None, 0.0
+    
+    if match is None:
+        return None, 0.0
+    
+    event, exact = match
+    if int(event['RoundNumber']) == 0:
+        return None, 0.0
+    
+    race_info = RaceInfo(
+        name=event['EventName'],
+        year=year,
+        circuit_id=schedule_cache.normalize_name(event['EventName']).replace(' ', '_'),
+        location=event['Location'],
+        country=event['Country']
+    )
+    return race_info, 1.0 if exact else 0.5
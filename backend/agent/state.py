@@ -1,4 +1,4 @@
-from typing import TypedDict, Annotated, List, Optional
+from typing import TypedDict, Annotated, Dict, List, Optional
 from langgraph.graph.message import add_messages
 
 class RaceInfo(TypedDict):
@@ -8,11 +8,20 @@ class RaceInfo(TypedDict):
     location: str
     country: str
 
-class ToolResult(TypedDict):
+class _ToolResultBase(TypedDict):
     tool_name: str
     success: bool
     data: dict
 
+class ToolResult(_ToolResultBase, total=False):
+    elapsed_ms: float
+    fetched_at: float
+    speculative: bool
+
+def merge_timings(current: Optional[Dict[str, float]], update: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Reducer so each node can add its own timings to the state."""
+    return {**(current or {}), **(update or {})}
+
 class AgentState(TypedDict):
     messages: Annotated[list, add_messages]
     race_query: str
@@ -21,3 +30,6 @@ class AgentState(TypedDict):
     tool_results: List[ToolResult]
     briefing: Optional[str]
     current_step: str
+    speculation_id: Optional[str]
+    refreshed_tools: List[str]
+    timings: Annotated[Dict[str, float], merge_timings]
@@ -0,0 +1,254 @@
+"""Generate many briefings in one pass with shared data loads.
+
+A batch plans every query, then collects the tool calls of all plans and
+runs each distinct call once: every race in a season asks for the same
+``get_season_standings(year)``, and repeated races share all of their
+calls. The data phase is admitted as one job by the briefing scheduler,
+runs at most BATCH_TOOL_CONCURRENCY calls at a time so interactive
+briefings keep FastF1 workers, and is cut off at the tool deadline. The
+synthesizers then run concurrently under a concurrency and
+per-minute limit, and results are yielded as each briefing finishes.
+"""
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from api import runtime
+from api.scheduler import job_scheduler
+from tools import metrics
+from tools.executor import fastf1_executor
+
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "40"))
+BATCH_PLAN_CONCURRENCY = int(os.getenv("BATCH_PLAN_CONCURRENCY", "4"))
+# Below the FastF1 executor's worker count, so a batch never takes every worker
+BATCH_TOOL_CONCURRENCY = int(os.getenv("BATCH_TOOL_CONCURRENCY", "2"))
+BATCH_SYNTH_CONCURRENCY = int(os.getenv("BATCH_SYNTH_CONCURRENCY", "3"))
+BATCH_SYNTH_PER_MINUTE = float(os.getenv("BATCH_SYNTH_PER_MINUTE", "20"))
+
+ToolCallKey = Tuple[str, str]
+
+class RateLimiter:
+    """At most ``concurrency`` holders at once, admitted no faster than ``per_minute``."""
+    
+    def __init__(self, concurrency: int, per_minute: float):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._interval = 60 / per_minute if per_minute > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+    
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            async with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start)
+                self._next_start = start_at + self._interval
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            yield
+
+def season_queries(year: int, remaining_only: bool = True) -> List[str]:
+    """One query per championship round of a season, optionally only races not yet run."""
+    import pandas as pd
+    from tools import schedule_cache
+    
+    schedule = schedule_cache.get_schedule(year)
+    rounds = schedule[schedule['RoundNumber'] > 0]
+    if remaining_only:
+        rounds = rounds[rounds['EventDate'] >= pd.Timestamp.now().normalize()]
+    return [f"{event['EventName']} {year}" for _, event in rounds.iterrows()]
+
+async def resolve_queries(queries: List[str], season: Optional[int], remaining_only: bool) -> List[str]:
+    """Explicit queries followed by the season's races, without duplicates.
+    
+    Raises:
+        ValueError: If the batch is empty or larger than BATCH_MAX_QUERIES
+    """
+    if season is not None:
+        queries = list(queries) + await fastf1_executor.run(season_queries, season, remaining_only)
+    queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    
+    if not queries:
+        raise ValueError("Batch contains no queries")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise ValueError(f"Batch has {len(queries)} queries; the limit is {BATCH_MAX_QUERIES}")
+    return queries
+
+def _call_key(task_name: str, args: Optional[Dict[str, Any]], index: int) -> ToolCallKey:
+    if args is None:
+        # Unknown tools fail per plan, never shared
+        return task_name, f"plan-{index}"
+    # Same encoding as agent.graph.tool_call_key, so speculative calls match
+    return task_name, json.dumps(args, sort_keys=True, default=str)
+
+async def run_batch(queries: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Plan, gather and synthesize briefings for ``queries``, yielding progress dicts.
+    
+    Yields dicts with a ``type`` of "planned", "data", "briefing", "failed"
+    and finally "complete". Briefings arrive in completion order; each
+    carries the ``index`` of its query.
+    
+    Raises:
+        SchedulerSaturated: If the briefing job queue is full when the data phase starts
+    """
+    stack = await runtime.get()
+    graph = stack.graph
+    started = time.perf_counter()
+    
+    plan_slots = asyncio.Semaphore(BATCH_PLAN_CONCURRENCY)
+    
+    async def plan(query: str) -> Dict[str, Any]:
+        async with plan_slots:
+            state = {
+                "messages": [],
+                "race_query": query,
+                "race_info": None,
+                "tasks": [],
+                "tool_results": [],
+                "briefing": None,
+                "current_step": "planning",
+                "timings": {}
+            }
+            try:
+                state.update(await graph.planner_node(state))
+            except Exception as e:
+                state.update(current_step="error", briefing=str(e) or type(e).__name__)
+            return state
+    
+    states = await asyncio.gather(*(plan(q) for q in queries))
+    planned = [i for i, state in enumerate(states) if state.get("race_info")]
+    yield {
+        "type": "planned",
+        "races": [
+            {"index": i, "query": queries[i], "race": state.get("race_info"), "tasks": state.get("tasks", [])}
+            for i, state in enumerate(states)
+        ]
+    }
+    
+    failed = 0
+    for i, state in enumerate(states):
+        if not state.get("race_info"):
+            failed += 1
+            yield {"type": "failed", "index": i, "query": queries[i],
+                   "message": state.get("briefing") or "Failed to plan briefing"}
+    
+    # Every distinct (tool, args) pair across the batch runs once
+    calls: Dict[ToolCallKey, Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]] = {}
+    plan_keys: Dict[int, List[ToolCallKey]] = {}
+    for i in planned:
+        race_info = states[i]["race_info"]
+        keys = []
+        for task_name in states[i]["tasks"]:
+            args = graph.build_tool_args(task_name, race_info) if task_name in graph.tool_map else None
+            key = _call_key(task_name, args, i)
+            calls.setdefault(key, (task_name, args, race_info))
+            keys.append(key)
+        plan_keys[i] = keys
+    
+    tool_slots = asyncio.Semaphore(BATCH_TOOL_CONCURRENCY)
+    
+    async def call(task_name: str, args: Optional[Dict[str, Any]], race_info: Dict[str, Any]):
+        async with tool_slots:
+            if args is None:
+                return await graph.run_tool(task_name, race_info)
+            return await graph.invoke_tool(task_name, args)
+    
+    # Calls the planners started speculatively are reused when a plan asked for them
+    speculative: Dict[ToolCallKey, asyncio.Future] = {}
+    for state in states:
+        for key, future in graph.claim_speculation(state.get("speculation_id")).items():
+            if key in speculative:
+                future.cancel()
+            else:
+                speculative[key] = future
+    reused = [key for key in calls if key in speculative]
+    metrics.SPECULATIVE_CALLS.inc(len(reused), result="reused")
+    metrics.SPECULATIVE_CALLS.inc(len(speculative) - len(reused), result="discarded")
+    
+    async def gather_data() -> Dict[ToolCallKey, Dict[str, Any]]:
+        """Run every distinct call; calls still running at TOOL_DEADLINE are cancelled."""
+        tools_started = time.perf_counter()
+        pending = [speculative.pop(key, None) or asyncio.ensure_future(call(*spec)) for key, spec in calls.items()]
+        for future in speculative.values():
+            future.cancel()
+        try:
+            if pending:
+                await asyncio.wait(pending, timeout=graph.TOOL_DEADLINE)
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        gathered = {}
+        for key, future in zip(calls, pending):
+            if future.cancelled() or isinstance(future.exception(), asyncio.CancelledError):
+                gathered[key] = graph.deadline_result(key[0], time.perf_counter() - tools_started)
+            else:
+                gathered[key] = future.result()
+        return gathered
+    
+    data_started = time.perf_counter()
+    # Counted against the same admission limit as interactive briefings
+    try:
+        job_scheduler.reserve()
+        results = await job_scheduler.run(gather_data)
+    finally:
+        # Speculative calls no plan asked for, or all of them if the data phase never ran
+        for future in speculative.values():
+            future.cancel()
+    yield {
+        "type": "data",
+        "tool_calls": sum(len(keys) for keys in plan_keys.values()),
+        "unique_tool_calls": len(calls),
+        "failed_tool_calls": sum(1 for r in results.values() if not r["success"]),
+        "elapsed_ms": round((time.perf_counter() - data_started) * 1000, 1)
+    }
+    
+    limiter = RateLimiter(BATCH_SYNTH_CONCURRENCY, BATCH_SYNTH_PER_MINUTE)
+    
+    async def synthesize(i: int) -> Dict[str, Any]:
+        state = dict(states[i])
+        state["tool_results"] = [dict(results[key]) for key in plan_keys[i]]
+        async with limiter.slot():
+            try:
+                update = await graph.synthesizer_node(state)
+            except Exception as e:
+                return {"type": "failed", "index": i, "query": queries[i], "message": str(e) or type(e).__name__}
+        timings = {**state.get("timings", {}), **update.get("timings", {})}
+        state.update(update, timings=timings)
+        return {
+            "type": "briefing",
+            "index": i,
+            "query": queries[i],
+            "race": state["race_info"],
+            "briefing": state["briefing"],
+            "tool_results": state["tool_results"],
+            "timings": timings
+        }
+    
+    succeeded = 0
+    pending = [asyncio.ensure_future(synthesize(i)) for i in planned]
+    try:
+        # Cancelled if the consumer stops reading, e.g. the client disconnects
+        for finished in asyncio.as_completed(pending):
+            outcome = await finished
+            if outcome["type"] == "briefing":
+                succeeded += 1
+            else:
+                failed += 1
+            yield outcome
+    finally:
+        for future in pending:
+            future.cancel()
+    
+    yield {
+        "type": "complete",
+        "succeeded": succeeded,
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "finished_at": datetime.now().isoformat(timespec="seconds")
+    }
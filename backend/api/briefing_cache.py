@@ -0,0 +1,198 @@
+"""Cross-request cache of briefing runs with single-flight deduplication.
+
+A run is keyed on the planned race and tool set. The first request for a key
+starts the run; concurrent and later identical requests attach to the same
+run and replay its recorded events, so the tools and synthesizer execute once
+per key per TTL. All methods must be called from the event loop thread.
+
+A run with no readers left is cancelled, so a briefing every client has
+abandoned stops consuming workers.
+
+Expired runs are not thrown away until they are replaced: their result is
+the starting point for an incremental refresh, which re-runs only the tools
+whose data has gone stale.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from tools import metrics
+from tools.naming import normalize_name
+
+BRIEFING_CACHE_TTL = float(os.getenv("BRIEFING_CACHE_TTL_SECONDS", "900"))
+BRIEFING_CACHE_SIZE = int(os.getenv("BRIEFING_CACHE_SIZE", "128"))
+
+def make_key(race_info: Dict[str, Any], tasks: List[str]) -> str:
+    """Normalized cache key for a planned briefing."""
+    return json.dumps([
+        normalize_name(race_info.get("name", "")),
+        int(race_info.get("year", 0)),
+        sorted(set(tasks)),
+    ])
+
+class BriefingRun:
+    """One briefing execution whose events can be replayed by any number of readers."""
+    
+    def __init__(self):
+        self.events: List[Dict[str, str]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._readers = 0
+        self._done = asyncio.Event()
+        self._signal = asyncio.Event()
+    
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    def publish(self, event: Dict[str, str]) -> None:
+        """Record an SSE event and wake up readers."""
+        self.events.append(event)
+        self._signal.set()
+        self._signal = asyncio.Event()
+    
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self.result = result
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._done.set()
+        self._signal.set()
+    
+    def cancel(self) -> None:
+        """Stop the run by cancelling the task driving the graph."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+    
+    def _attach(self) -> None:
+        self._readers += 1
+    
+    def _detach(self) -> None:
+        self._readers -= 1
+        if self._readers <= 0 and not self.done:
+            print("Briefing run abandoned by all readers, cancelling")
+            self.cancel()
+    
+    async def wait(self) -> None:
+        self._attach()
+        try:
+            await self._done.wait()
+        finally:
+            self._detach()
+    
+    async def replay(self) -> AsyncIterator[Dict[str, str]]:
+        """Yield every recorded event, then new ones as they are published."""
+        self._attach()
+        try:
+            position = 0
+            while True:
+                signal = self._signal
+                while position < len(self.events):
+                    yield self.events[position]
+                    position += 1
+                if self.done:
+                    return
+                await signal.wait()
+        finally:
+            self._detach()
+
+class BriefingCache:
+    """TTL + LRU cache of briefing runs keyed by :func:`make_key`."""
+    
+    def __init__(self, ttl: float = BRIEFING_CACHE_TTL, max_entries: int = BRIEFING_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._runs: "OrderedDict[str, BriefingRun]" = OrderedDict()
+    
+    def _is_valid(self, run: BriefingRun) -> bool:
+        if not run.done:
+            return True
+        if run.error:
+            return False
+        return time.monotonic() - run.finished_at < self.ttl
+    
+    def get(self, key: str) -> Optional[BriefingRun]:
+        """The valid run for ``key``; an expired run stays stored until it is replaced."""
+        run = self._runs.get(key)
+        if run is None or not self._is_valid(run):
+            return None
+        self._runs.move_to_end(key)
+        return run
+    
+    def _evict(self) -> None:
+        """Drop least recently used finished runs beyond max_entries; in-flight runs are kept."""
+        excess = len(self._runs) - self.max_entries
+        if excess > 0:
+            for key in [key for key, run in self._runs.items() if run.done][:excess]:
+                del self._runs[key]
+    
+    def latest_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Result of the last successful run for ``key``, even if it has expired."""
+        run = self._runs.get(key)
+        if run is None or not run.done or run.error:
+            return None
+        return run.result
+    
+    def get_or_start(self, key: str, start: Callable[[BriefingRun], Awaitable[None]],
+                     admit: Optional[Callable[[], None]] = None, force: bool = False,
+                     incremental: bool = False) -> BriefingRun:
+        """Return the cached or in-flight run for ``key``, starting one if needed.
+        
+        ``admit`` is called only when a new run is about to start and may
+        raise to refuse it. With ``force``, a finished run is replaced even if
+        it has not expired; an in-flight run is still shared. An
+        ``incremental`` run (a refresh of a previous result) is not counted as
+        a miss; the caller records its outcome once it knows whether anything
+        changed.
+        """
+        run = self.get(key)
+        if run is not None and force and run.done:
+            run = None
+        if run is not None:
+            self.hits += 1
+            metrics.cache_hit("briefing")
+            return run
+        
+        if admit is not None:
+            admit()
+        if incremental:
+            self.refreshes += 1
+        else:
+            self.misses += 1
+            metrics.cache_miss("briefing")
+        run = BriefingRun()
+        self._runs[key] = run
+        self._runs.move_to_end(key)
+        self._evict()
+        
+        async def execute():
+            try:
+                await start(run)
+            except Exception as e:
+                message = str(e) or type(e).__name__
+                run.publish({"event": "error", "data": json.dumps({"message": message})})
+                run.finish(error=message)
+        
+        def settle(task: asyncio.Task) -> None:
+            # Also runs when the task is cancelled before execute() ever started
+            if not run.done:
+                run.finish(error="Briefing run was cancelled" if task.cancelled()
+                           else "Briefing run ended without a result")
+            if run.error and self._runs.get(key) is run:
+                del self._runs[key]
+        
+        run.task = asyncio.create_task(execute())
+        run.task.add_done_callback(settle)
+        return run
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._runs), "hits": self.hits, "misses": self.misses, "refreshes": self.refreshes}
+
+briefing_cache = BriefingCache()
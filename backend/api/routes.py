@@ -1,153 +1,321 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from sse_starlette.sse import EventSourceResponse
 import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor
+import os
 
-from agent.graph import agent
-from agent.state import AgentState
+from api import batch, runtime
+from api.briefing_cache import BriefingRun, briefing_cache, make_key
+from api.scheduler import SchedulerSaturated, job_scheduler
+from tools import derived_store, metrics
+from tools.executor import fastf1_executor
 
-executor = ThreadPoolExecutor(max_workers=4)
+if TYPE_CHECKING:
+    # agent.state pulls in LangGraph, which is loaded by api.runtime instead
+    from agent.state import AgentState
 
 router = APIRouter(prefix="/api")
 
+# Also start expired cached briefings from their previous result instead of
+# from scratch. Off by default: results are then reused until their freshness
+# max age (agent.freshness.TOOL_MAX_AGE), so BRIEFING_CACHE_TTL_SECONDS no
+# longer bounds how old a briefing's data can be.
+INCREMENTAL_REFRESH = os.getenv("INCREMENTAL_REFRESH", "false").lower() == "true"
+
 class BriefingRequest(BaseModel):
     query: str
 
+class BatchBriefingRequest(BaseModel):
+    queries: List[str] = []
+    season: Optional[int] = None
+    remaining_only: bool = True
+
 class BriefingResponse(BaseModel):
     race: str
     briefing: str
     tool_trace: List[Dict[str, Any]]
+    timings: Dict[str, float] = {}
+    refreshed_tools: List[str] = []
+
+def initial_state(query: str) -> "AgentState":
+    return {
+        "messages": [],
+        "race_query": query,
+        "race_info": None,
+        "tasks": [],
+        "tool_results": [],
+        "briefing": None,
+        "current_step": "planning",
+        "timings": {}
+    }
+
+async def plan_briefing(query: str) -> "AgentState":
+    """Run the planner and return the state the execution graph starts from."""
+    stack = await runtime.get()
+    state = initial_state(query)
+    state.update(await stack.graph.planner_node(state))
+    return state
+
+def tool_event(tool_result: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "event": "tool_result",
+        "data": json.dumps({
+            "tool": tool_result["tool_name"],
+            "success": tool_result["success"],
+            "elapsed_ms": tool_result.get("elapsed_ms"),
+            "speculative": tool_result.get("speculative", False)
+        })
+    }
+
+def tool_trace(tool_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "tool": tr["tool_name"],
+            "success": tr["success"],
+            "elapsed_ms": tr.get("elapsed_ms"),
+            "speculative": tr.get("speculative", False),
+            "fetched_at": tr.get("fetched_at"),
+            "summary": str(tr["data"])[:200] + "..." if len(str(tr["data"])) > 200 else str(tr["data"])
+        }
+        for tr in tool_results
+    ]
+
+def step_events(node: str, update: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Translate an execution graph step into SSE events.
+    
+    Individual tool results arrive earlier on the custom stream, see tool_event.
+    """
+    events = []
+    if node == "tool_executor":
+        if update.get("current_step") == "complete":
+            events.append({
+                "event": "status",
+                "data": json.dumps({"step": "complete", "message": "Briefing data is unchanged"})
+            })
+        else:
+            events.append({
+                "event": "status",
+                "data": json.dumps({"step": "synthesizing", "message": "Generating briefing..."})
+            })
+    elif node == "synthesizer":
+        briefing = update.get("briefing")
+        if briefing:
+            events.append({
+                "event": "briefing",
+                "data": json.dumps({"content": briefing})
+            })
+            events.append({
+                "event": "complete",
+                "data": json.dumps({"message": "Briefing complete"})
+            })
+    return events
+
+def discard_speculation(state: "AgentState") -> None:
+    """Cancel speculative tool calls the planner started for a run that will not execute."""
+    speculation_id = state.get("speculation_id")
+    if speculation_id:
+        from agent import graph  # already loaded, the planner ran
+        graph.discard_speculation(speculation_id)
+
+def start_briefing(state: "AgentState", refresh: bool = False) -> BriefingRun:
+    """Attach to the cached or in-flight run for a planned briefing, starting one if needed.
+    
+    With ``refresh`` (or INCREMENTAL_REFRESH), a new run for a race that was
+    briefed before starts from the previous result and re-fetches only stale
+    tools; ``refresh`` also forces a new run even if the cached briefing has
+    not expired.
+    
+    Raises:
+        SchedulerSaturated: If a new run is needed but the job queue is full
+    """
+    key = make_key(state["race_info"], state["tasks"])
+    previous = briefing_cache.latest_result(key) if INCREMENTAL_REFRESH or refresh else None
+    if previous:
+        state = {
+            **state,
+            "tool_results": previous.get("tool_results", []),
+            "briefing": previous.get("briefing")
+        }
+    
+    async def stream_graph(run: BriefingRun):
+        stack = await runtime.get()
+        result = dict(state)
+        stream_mode = ["updates", "messages", "custom"]
+        synthesized = False
+        
+        async for mode, chunk in stack.execution_agent.astream(state, stream_mode=stream_mode):
+            if mode == "messages":
+                message, metadata = chunk
+                delta = stack.graph.message_text(message.content)
+                if metadata.get("langgraph_node") == "synthesizer" and delta:
+                    run.publish({"event": "briefing_delta", "data": json.dumps({"delta": delta})})
+                continue
+            
+            if mode == "custom":
+                if "tool_result" in chunk:
+                    run.publish(tool_event(chunk["tool_result"]))
+                continue
+            
+            for node, update in chunk.items():
+                print(f"{node} completed")
+                synthesized = synthesized or node == "synthesizer"
+                timings = {**result.get("timings", {}), **update.get("timings", {})}
+                result.update(update, timings=timings)
+                for event in step_events(node, update):
+                    run.publish(event)
+        
+        if previous:
+            # A refresh that changed nothing served the cached briefing
+            metrics.CACHE_REQUESTS.inc(cache="briefing", result="refresh" if synthesized else "refresh_unchanged")
+        
+        if result.get("current_step") == "error" or not result.get("briefing"):
+            message = result.get("briefing") or "Failed to generate briefing"
+            run.publish({"event": "error", "data": json.dumps({"message": message})})
+            run.finish(error=message)
+        else:
+            if not synthesized:
+                # A refresh with no changed data keeps the previous briefing
+                for event in step_events("synthesizer", {"briefing": result["briefing"]}):
+                    run.publish(event)
+            run.finish(result)
+    
+    reservation_used = False
+    
+    async def execute(run: BriefingRun):
+        nonlocal reservation_used
+        # From here on job_scheduler.run() owns the reservation and releases it
+        reservation_used = True
+        try:
+            await job_scheduler.run(lambda: stream_graph(run))
+        except asyncio.TimeoutError:
+            message = f"Briefing exceeded the {job_scheduler.job_deadline:.0f}s job deadline"
+            run.publish({"event": "error", "data": json.dumps({"message": message})})
+            run.finish(error=message)
+    
+    admitted = False
+    
+    def admit():
+        nonlocal admitted
+        job_scheduler.reserve()
+        admitted = True
+    
+    try:
+        run = briefing_cache.get_or_start(key, execute, admit=admit, force=refresh, incremental=bool(previous))
+    except SchedulerSaturated:
+        discard_speculation(state)
+        raise
+    if not admitted:
+        # Served by a cached or in-flight run, so the planner's speculative calls are not needed
+        discard_speculation(state)
+    else:
+        # A run cancelled before execute() starts would otherwise hold its queue slot forever
+        run.task.add_done_callback(lambda _: reservation_used or job_scheduler.release())
+    return run
+
+def saturated_error(e: SchedulerSaturated) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
 @router.post("/briefing", response_model=BriefingResponse)
 async def generate_briefing(request: BriefingRequest):
     """Generate a race briefing for the given query."""
+    with metrics.REQUEST_SECONDS.time(endpoint="briefing"):
+        return await _generate_briefing(request)
+
+@router.post("/briefing/refresh", response_model=BriefingResponse)
+async def refresh_briefing(request: BriefingRequest):
+    """Bring the cached briefing for a query up to date.
+    
+    Only tools whose data is past its maximum age (weather and news within
+    the hour, track and history after days) are fetched again, and the
+    briefing is only rewritten if their data changed. ``refreshed_tools``
+    lists those tools.
+    """
+    with metrics.REQUEST_SECONDS.time(endpoint="briefing_refresh"):
+        return await _generate_briefing(request, refresh=True)
+
+async def _generate_briefing(request: BriefingRequest, refresh: bool = False) -> BriefingResponse:
     try:
-        initial_state: AgentState = {
-            "messages": [],
-            "race_query": request.query,
-            "race_info": None,
-            "tasks": [],
-            "tool_results": [],
-            "briefing": None,
-            "current_step": "planning"
-        }
+        # Reject before spending a planner LLM call on a request that cannot be admitted
+        job_scheduler.check()
+        state = await plan_briefing(request.query)
+        if not state.get("race_info"):
+            raise HTTPException(status_code=500, detail=state.get("briefing") or "Failed to generate briefing")
         
-        result = agent.invoke(initial_state)
+        run = start_briefing(state, refresh=refresh)
+        await run.wait()
         
-        if result.get("current_step") == "error" or not result.get("briefing"):
-            raise HTTPException(status_code=500, detail="Failed to generate briefing")
+        if run.error:
+            raise HTTPException(status_code=500, detail=run.error)
         
+        result = run.result
         race_name = result.get("race_info", {}).get("name", "Unknown Race")
         
-        tool_trace = [
-            {
-                "tool": tr["tool_name"],
-                "success": tr["success"],
-                "summary": str(tr["data"])[:200] + "..." if len(str(tr["data"])) > 200 else str(tr["data"])
-            }
-            for tr in result.get("tool_results", [])
-        ]
-        
         return BriefingResponse(
             race=race_name,
             briefing=result["briefing"],
-            tool_trace=tool_trace
+            tool_trace=tool_trace(result.get("tool_results", [])),
+            timings=result.get("timings", {}),
+            refreshed_tools=result.get("refreshed_tools", [])
         )
+    except HTTPException:
+        raise
+    except SchedulerSaturated as e:
+        raise saturated_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/briefing/stream")
 async def generate_briefing_stream(request: BriefingRequest):
     """Generate a race briefing with streaming updates."""
+    try:
+        job_scheduler.check()
+    except SchedulerSaturated as e:
+        raise saturated_error(e)
+    
     async def event_generator():
         try:
             print(f"Starting briefing generation for: {request.query}")
             
-            initial_state: AgentState = {
-                "messages": [],
-                "race_query": request.query,
-                "race_info": None,
-                "tasks": [],
-                "tool_results": [],
-                "briefing": None,
-                "current_step": "planning"
-            }
-            
             yield {
                 "event": "status",
                 "data": json.dumps({"step": "planning", "message": "Planning data gathering..."})
             }
             
-            await asyncio.sleep(0.1)
+            state = await plan_briefing(request.query)
+            print("Planner completed")
             
-            print("Invoking agent...")
+            race_info = state.get("race_info")
+            if not race_info:
+                yield {
+                    "event": "error",
+                    "data": json.dumps({"message": state.get("briefing") or "Failed to plan briefing"})
+                }
+                return
             
-            # Run the agent in a thread pool since it's synchronous
-            loop = asyncio.get_event_loop()
-            
-            def run_agent():
-                results = []
-                for step_result in agent.stream(initial_state):
-                    results.append(step_result)
-                return results
-            
-            step_results = await loop.run_in_executor(executor, run_agent)
+            yield {
+                "event": "race_info",
+                "data": json.dumps(race_info)
+            }
+            yield {
+                "event": "status",
+                "data": json.dumps({"step": "gathering", "message": "Gathering race data..."})
+            }
             
-            result = {}
-            for step_result in step_results:
-                print(f"Step result: {list(step_result.keys())}")
-                result.update(step_result)
-                
-                current_step = list(step_result.keys())[0] if step_result else "unknown"
-                step_data = step_result.get(current_step, {})
-                
-                if current_step == "planner":
-                    print("Planner completed")
-                    race_info = step_data.get("race_info")
-                    if race_info:
-                        yield {
-                            "event": "race_info",
-                            "data": json.dumps(race_info)
-                        }
-                    yield {
-                        "event": "status",
-                        "data": json.dumps({"step": "gathering", "message": "Gathering race data..."})
-                    }
-                
-                elif current_step == "tool_executor":
-                    print("Tool executor completed")
-                    tool_results = step_data.get("tool_results", [])
-                    for tr in tool_results:
-                        yield {
-                            "event": "tool_result",
-                            "data": json.dumps({
-                                "tool": tr["tool_name"],
-                                "success": tr["success"]
-                            })
-                        }
-                    yield {
-                        "event": "status",
-                        "data": json.dumps({"step": "synthesizing", "message": "Generating briefing..."})
-                    }
-                
-                elif current_step == "synthesizer":
-                    print("Synthesizer completed")
-                    briefing = step_data.get("briefing")
-                    if briefing:
-                        yield {
-                            "event": "briefing",
-                            "data": json.dumps({"content": briefing})
-                        }
-                        yield {
-                            "event": "complete",
-                            "data": json.dumps({"message": "Briefing complete"})
-                        }
+            # Cached runs replay immediately; in-flight runs are shared with other requests
+            run = start_briefing(state)
+            async for event in run.replay():
+                yield event
             
             print("Agent execution completed")
-            
+        
+        except SchedulerSaturated as e:
+            yield {
+                "event": "error",
+                "data": json.dumps({"message": str(e), "retry_after": e.retry_after})
+            }
         except Exception as e:
             print(f"ERROR in briefing generation: {str(e)}")
             import traceback
@@ -159,12 +327,54 @@ async def generate_briefing_stream(request: BriefingRequest):
     
     return EventSourceResponse(event_generator())
 
+@router.post("/briefing/batch")
+async def generate_briefing_batch(request: BatchBriefingRequest):
+    """Generate briefings for many races, streaming each one as it finishes.
+    
+    Takes explicit queries, a whole season (``season``, by default only the
+    races not yet run) or both. Tool calls shared between races run once.
+    """
+    try:
+        job_scheduler.check()
+        queries = await batch.resolve_queries(request.queries, request.season, request.remaining_only)
+    except SchedulerSaturated as e:
+        raise saturated_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def event_generator():
+        yield {
+            "event": "status",
+            "data": json.dumps({"step": "planning", "message": f"Planning {len(queries)} briefings..."})
+        }
+        try:
+            async for item in batch.run_batch(queries):
+                kind = item.pop("type")
+                if kind == "briefing":
+                    item["tool_trace"] = tool_trace(item.pop("tool_results"))
+                yield {"event": f"batch_{kind}", "data": json.dumps(item, default=str)}
+        except SchedulerSaturated as e:
+            yield {
+                "event": "error",
+                "data": json.dumps({"message": str(e), "retry_after": e.retry_after})
+            }
+        except Exception as e:
+            print(f"ERROR in batch briefing generation: {str(e)}")
+            yield {
+                "event": "error",
+                "data": json.dumps({"message": str(e)})
+            }
+    
+    return EventSourceResponse(event_generator())
+
 @router.get("/races/{year}")
 async def get_races(year: int):
     """Get F1 calendar for a specific year."""
     try:
-        import fastf1
-        schedule = fastf1.get_event_schedule(year)
+        stack = await runtime.get()
+        schedule = await fastf1_executor.run(stack.schedule_cache.get_schedule, year)
         
         races = []
         for _, event in schedule.iterrows():
@@ -182,5 +392,34 @@ async def get_races(year: int):
 
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok", "service": "f1-briefing-agent"}
+    """Health check endpoint.
+    
+    Answers while the agent stack is still loading; ``ready`` reports whether
+    briefing requests can be served without waiting for it.
+    """
+    return {"status": "ok", "service": "f1-briefing-agent", "ready": runtime.is_ready()}
+
+@router.get("/status")
+async def service_status():
+    """Concurrency limits, queue depth, job timings and cache counters."""
+    return {
+        "runtime": runtime.status(),
+        "executors": [fastf1_executor.stats()],
+        "jobs": job_scheduler.stats(),
+        "briefing_cache": briefing_cache.stats(),
+        "derived_store": derived_store.stats(),
+        "news_cache": (await runtime.get()).news_client.stats() if runtime.is_ready() else None,
+        "session_cache": (await runtime.get()).session_loader.stats() if runtime.is_ready() else None
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Latency histograms, cache hit/miss counters and LLM token usage for Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/warmup")
+async def warmup_status():
+    """Progress of the background cache warm-up."""
+    if not runtime.is_ready():
+        return {"state": "waiting", "runtime": runtime.status()["state"]}
+    return (await runtime.get()).warmup.status()
@@ -0,0 +1,81 @@
+"""Deferred loading of the agent stack.
+
+Importing LangGraph, LangChain, FastF1 and pandas and compiling the graphs
+takes seconds, so none of it happens when the API module is imported. The
+app lifespan calls start(), which loads the stack in a background thread;
+request handlers that need it await get(). Lightweight endpoints such as
+/api/health answer while loading is still in progress.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+_future: Optional[Future] = None
+_load_seconds: Optional[float] = None
+_lock = threading.Lock()
+
+def _import_stack() -> SimpleNamespace:
+    """Import the heavy modules and build the graphs and LLM client."""
+    global _load_seconds
+    started = time.perf_counter()
+    
+    from agent import graph
+    from tools import news_client, schedule_cache, session_loader, warmup
+    
+    graph.get_llm()
+    agent, execution_agent = graph.get_agents()
+    
+    _load_seconds = time.perf_counter() - started
+    print(f"Agent stack loaded in {_load_seconds:.2f}s")
+    return SimpleNamespace(
+        graph=graph,
+        agent=agent,
+        execution_agent=execution_agent,
+        news_client=news_client,
+        schedule_cache=schedule_cache,
+        session_loader=session_loader,
+        warmup=warmup
+    )
+
+def _load(future: Future) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(_import_stack())
+    except BaseException as e:
+        print(f"Agent stack failed to load: {e}")
+        future.set_exception(e)
+
+def start() -> Future:
+    """Begin loading the stack in a background thread (idempotent)."""
+    global _future
+    with _lock:
+        if _future is None or _future.cancelled():
+            _future = Future()
+            threading.Thread(target=_load, args=(_future,), name="runtime-loader", daemon=True).start()
+        return _future
+
+async def get() -> SimpleNamespace:
+    """The loaded stack, starting or waiting for the load as needed."""
+    # A caller that is cancelled (e.g. a disconnected client) must not cancel the shared load
+    return await asyncio.shield(asyncio.wrap_future(start()))
+
+def is_ready() -> bool:
+    future = _future
+    return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+def status() -> Dict[str, Any]:
+    """Loading state for health and status endpoints."""
+    future = _future
+    if future is None:
+        return {"state": "idle"}
+    if not future.done():
+        return {"state": "loading"}
+    if future.cancelled():
+        return {"state": "failed", "error": "Loading was cancelled"}
+    if future.exception() is not None:
+        return {"state": "failed", "error": str(future.exception())}
+    return {"state": "ready", "load_seconds": round(_load_seconds or 0, 3)}
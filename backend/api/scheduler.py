@@ -0,0 +1,123 @@
+"""Admission control and deadlines for briefing jobs.
+
+At most BRIEFING_WORKERS briefing runs execute at once and at most
+BRIEFING_QUEUE_SIZE more may wait for a slot. Beyond that new work is
+rejected with a Retry-After hint instead of queueing without limit. Every
+job is bounded by BRIEFING_JOB_DEADLINE_SECONDS. All methods must be called
+from the event loop thread.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, TypeVar
+
+T = TypeVar("T")
+
+BRIEFING_WORKERS = int(os.getenv("BRIEFING_WORKERS", "4"))
+BRIEFING_QUEUE_SIZE = int(os.getenv("BRIEFING_QUEUE_SIZE", "16"))
+BRIEFING_JOB_DEADLINE = float(os.getenv("BRIEFING_JOB_DEADLINE_SECONDS", "120"))
+
+class SchedulerSaturated(Exception):
+    """Raised when both the workers and the admission queue are full."""
+    
+    def __init__(self, retry_after: int):
+        super().__init__(f"Briefing service is at capacity, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+def percentile(samples: Deque[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+class JobScheduler:
+    """Bounded worker slots with an admission queue and per-job deadlines."""
+    
+    def __init__(self, max_workers: int = BRIEFING_WORKERS, max_queue: int = BRIEFING_QUEUE_SIZE,
+                 job_deadline: float = BRIEFING_JOB_DEADLINE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.job_deadline = job_deadline
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.queue_wait: Deque[float] = deque(maxlen=500)
+        self.run_time: Deque[float] = deque(maxlen=500)
+        self._slots = asyncio.Semaphore(max_workers)
+    
+    def retry_after(self) -> int:
+        """Seconds until a queue position is likely to free up."""
+        typical_run = percentile(self.run_time, 0.5) or 10.0
+        backlog = (self.active + self.queued) / self.max_workers
+        return max(1, math.ceil(typical_run * backlog))
+    
+    def check(self) -> None:
+        """Raise SchedulerSaturated if a new job would not be admitted."""
+        if self.active + self.queued >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise SchedulerSaturated(self.retry_after())
+    
+    def reserve(self) -> None:
+        """Claim an admission queue position; pair with exactly one run() or release()."""
+        self.check()
+        self.queued += 1
+    
+    def release(self) -> None:
+        """Give back a reservation whose run() never started, e.g. the job was cancelled first."""
+        self.queued -= 1
+    
+    async def run(self, job: Callable[[], Awaitable[T]]) -> T:
+        """Wait for a worker slot, then run ``job`` under the job deadline.
+        
+        Raises:
+            asyncio.TimeoutError: If the job exceeds the deadline
+        """
+        enqueued = time.monotonic()
+        waiting = True
+        try:
+            async with self._slots:
+                waiting = False
+                self.queued -= 1
+                self.active += 1
+                started = time.monotonic()
+                self.queue_wait.append(started - enqueued)
+                try:
+                    result = await asyncio.wait_for(job(), self.job_deadline)
+                    self.completed += 1
+                    return result
+                except asyncio.TimeoutError:
+                    self.timed_out += 1
+                    raise
+                except Exception:
+                    self.failed += 1
+                    raise
+                finally:
+                    self.active -= 1
+                    self.run_time.append(time.monotonic() - started)
+        finally:
+            if waiting:
+                self.queued -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "job_deadline_s": self.job_deadline,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "queue_wait_p50_ms": round(percentile(self.queue_wait, 0.5) * 1000, 1),
+            "queue_wait_p95_ms": round(percentile(self.queue_wait, 0.95) * 1000, 1),
+            "run_time_p50_ms": round(percentile(self.run_time, 0.5) * 1000, 1),
+            "run_time_p95_ms": round(percentile(self.run_time, 0.95) * 1000, 1)
+        }
+
+job_scheduler = JobScheduler()
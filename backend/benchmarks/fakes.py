@@ -0,0 +1,298 @@
+"""Offline stand-ins for the LLM and every external data source.
+
+install() swaps in a fake chat model, a canned FastF1 calendar and sessions,
+the fake news backend and a mock OpenWeather transport. Each fake sleeps for
+a configurable latency so the pipeline's concurrency behaves as it would
+against the real services, without API keys, credits or network access.
+"""
+import asyncio
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import fastf1
+import httpx
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# (EventName, Location, Country, EventFormat)
+CALENDAR = [
+    ("Bahrain Grand Prix", "Sakhir", "Bahrain", "conventional"),
+    ("Saudi Arabian Grand Prix", "Jeddah", "Saudi Arabia", "conventional"),
+    ("Australian Grand Prix", "Melbourne", "Australia", "conventional"),
+    ("Japanese Grand Prix", "Suzuka", "Japan", "conventional"),
+    ("Chinese Grand Prix", "Shanghai", "China", "sprint_qualifying"),
+    ("Miami Grand Prix", "Miami", "United States", "sprint_qualifying"),
+    ("Emilia Romagna Grand Prix", "Imola", "Italy", "conventional"),
+    ("Monaco Grand Prix", "Monaco", "Monaco", "conventional"),
+    ("Spanish Grand Prix", "Barcelona", "Spain", "conventional"),
+    ("Canadian Grand Prix", "Montréal", "Canada", "conventional"),
+    ("Austrian Grand Prix", "Spielberg", "Austria", "conventional"),
+    ("British Grand Prix", "Silverstone", "United Kingdom", "conventional"),
+    ("Belgian Grand Prix", "Spa-Francorchamps", "Belgium", "sprint_qualifying"),
+    ("Hungarian Grand Prix", "Budapest", "Hungary", "conventional"),
+    ("Dutch Grand Prix", "Zandvoort", "Netherlands", "conventional"),
+    ("Italian Grand Prix", "Monza", "Italy", "conventional"),
+    ("Azerbaijan Grand Prix", "Baku", "Azerbaijan", "conventional"),
+    ("Singapore Grand Prix", "Marina Bay", "Singapore", "conventional"),
+    ("United States Grand Prix", "Austin", "United States", "sprint_qualifying"),
+    ("Mexico City Grand Prix", "Mexico City", "Mexico", "conventional"),
+    ("São Paulo Grand Prix", "São Paulo", "Brazil", "sprint_qualifying"),
+    ("Las Vegas Grand Prix", "Las Vegas", "United States", "conventional"),
+    ("Qatar Grand Prix", "Lusail", "Qatar", "sprint_qualifying"),
+    ("Abu Dhabi Grand Prix", "Yas Island", "United Arab Emirates", "conventional"),
+]
+
+# (Abbreviation, DriverNumber, FullName, TeamName)
+DRIVERS = [
+    ("VER", "1", "Max Verstappen", "Red Bull Racing"),
+    ("NOR", "4", "Lando Norris", "McLaren"),
+    ("LEC", "16", "Charles Leclerc", "Ferrari"),
+    ("PIA", "81", "Oscar Piastri", "McLaren"),
+    ("SAI", "55", "Carlos Sainz", "Williams"),
+    ("HAM", "44", "Lewis Hamilton", "Ferrari"),
+    ("RUS", "63", "George Russell", "Mercedes"),
+    ("PER", "11", "Sergio Perez", "Red Bull Racing"),
+    ("ALO", "14", "Fernando Alonso", "Aston Martin"),
+    ("STR", "18", "Lance Stroll", "Aston Martin"),
+    ("GAS", "10", "Pierre Gasly", "Alpine"),
+    ("OCO", "31", "Esteban Ocon", "Haas F1 Team"),
+    ("ALB", "23", "Alexander Albon", "Williams"),
+    ("TSU", "22", "Yuki Tsunoda", "RB"),
+    ("HUL", "27", "Nico Hulkenberg", "Kick Sauber"),
+    ("BOT", "77", "Valtteri Bottas", "Kick Sauber"),
+    ("MAG", "20", "Kevin Magnussen", "Haas F1 Team"),
+    ("ZHO", "24", "Zhou Guanyu", "Kick Sauber"),
+    ("LAW", "30", "Liam Lawson", "RB"),
+    ("ANT", "12", "Andrea Kimi Antonelli", "Mercedes"),
+]
+
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+SPRINT_POINTS = [8, 7, 6, 5, 4, 3, 2, 1]
+
+def canned_schedule(year: int) -> pd.DataFrame:
+    """A FastF1-shaped event schedule; the current season is half run."""
+    if year < datetime.now().year:
+        first = datetime(year, 3, 2)
+    else:
+        first = datetime.now() - timedelta(weeks=len(CALENDAR))
+    rows = [{
+        "RoundNumber": 0,
+        "Country": "Bahrain",
+        "Location": "Sakhir",
+        "OfficialEventName": f"FORMULA 1 PRE-SEASON TESTING {year}",
+        "EventDate": pd.Timestamp(first - timedelta(weeks=1)),
+        "EventName": "Pre-Season Testing",
+        "EventFormat": "testing",
+    }]
+    for i, (name, location, country, event_format) in enumerate(CALENDAR):
+        rows.append({
+            "RoundNumber": i + 1,
+            "Country": country,
+            "Location": location,
+            "OfficialEventName": f"FORMULA 1 {name.upper()} {year}",
+            "EventDate": pd.Timestamp(first + timedelta(weeks=2 * i)),
+            "EventName": name,
+            "EventFormat": event_format,
+        })
+    return pd.DataFrame(rows)
+
+class CannedSession:
+    """Minimal FastF1 Session: ``load`` sleeps, then ``results``, ``event`` and (if asked) ``laps`` are available."""
+    
+    def __init__(self, year: int, event: Any, session_name: str, latency: float):
+        schedule = canned_schedule(year)
+        if isinstance(event, str):
+            match = schedule[schedule['EventName'].str.contains(event.split(' Grand Prix')[0], case=False)]
+            row = match.iloc[0] if not match.empty else schedule.iloc[1]
+        else:
+            row = schedule[schedule['RoundNumber'] == int(event)].iloc[0]
+        self.event = pd.Series({**row.to_dict(), "CircuitLength": 5.0 + int(row['RoundNumber']) % 3 * 0.4})
+        self.name = session_name
+        self.latency = latency
+        self.results = pd.DataFrame()
+        self.laps = pd.DataFrame()
+        self._seed = year * 100 + int(row['RoundNumber']) + (50 if session_name == 'S' else 0)
+    
+    def load(self, **kwargs) -> None:
+        time.sleep(self.latency)
+        order = sorted(range(len(DRIVERS)), key=lambda i: (i * 7 + self._seed) % len(DRIVERS) + i * 0.5)
+        points = SPRINT_POINTS if self.name == 'S' else POINTS
+        self.results = pd.DataFrame([{
+            "DriverNumber": DRIVERS[d][1],
+            "Abbreviation": DRIVERS[d][0],
+            "FullName": DRIVERS[d][2],
+            "TeamName": DRIVERS[d][3],
+            "Position": float(pos + 1),
+            "GridPosition": float((pos + self._seed) % len(DRIVERS) + 1),
+            "Points": float(points[pos]) if pos < len(points) else 0.0,
+            "Status": "Finished" if pos < 17 else "Retired",
+            "Time": pd.Timedelta(seconds=5400 + pos * 4.2),
+        } for pos, d in enumerate(order)])
+        if kwargs.get("laps"):
+            self.laps = self._laps(order)
+    
+    def _laps(self, order: List[int]) -> pd.DataFrame:
+        """Laps for every driver in finishing order: three stints of fuel burn and tyre wear."""
+        qualifying = self.name in ('Q', 'SQ')
+        count = 3 if qualifying else 57
+        pace = np.repeat(np.arange(len(order)) * 0.09, count)
+        lap = np.tile(np.arange(1, count + 1), len(order))
+        stint = 1 + (lap > 19).astype(int) + (lap > 38).astype(int)
+        stint_start = np.select([stint == 3, stint == 2], [39, 20], 1)
+        tyre_life = lap - stint_start + 1
+        noise = np.random.default_rng(self._seed).normal(0, 0.15, lap.size)
+        if qualifying:
+            seconds = 88.0 + pace + noise
+        else:
+            seconds = 93.0 + pace + 0.06 * tyre_life - 0.03 * lap + noise
+        pit_in = np.isin(lap, [19, 38])
+        pit_out = np.isin(lap, [20, 39])
+        lap_time = pd.to_timedelta(seconds, unit='s')
+        return pd.DataFrame({
+            "Driver": np.repeat([DRIVERS[d][0] for d in order], count),
+            "Team": np.repeat([DRIVERS[d][3] for d in order], count),
+            "LapNumber": lap.astype(float),
+            "LapTime": lap_time,
+            "Stint": stint.astype(float),
+            "Compound": np.select([stint == 1, stint == 2], ["MEDIUM", "HARD"], "SOFT"),
+            "TyreLife": tyre_life.astype(float),
+            "Sector1Time": lap_time * 0.31,
+            "Sector2Time": lap_time * 0.42,
+            "Sector3Time": lap_time * 0.27,
+            "PitInTime": pd.to_timedelta(np.where(pit_in, seconds, np.nan), unit='s'),
+            "PitOutTime": pd.to_timedelta(np.where(pit_out, seconds, np.nan), unit='s'),
+            "TrackStatus": "1",
+            "IsAccurate": True,
+            "Deleted": False,
+        })
+
+def install_fastf1(session_latency: float, schedule_latency: float = 0.0) -> None:
+    """Point the FastF1 entry points used by schedule_cache and session_loader at canned data."""
+    def get_event_schedule(year: int, **kwargs) -> pd.DataFrame:
+        time.sleep(schedule_latency)
+        return canned_schedule(year)
+    
+    def get_session(year: int, event: Any, session_name: str) -> CannedSession:
+        return CannedSession(year, event, session_name, session_latency)
+    
+    fastf1.get_event_schedule = get_event_schedule
+    fastf1.get_session = get_session
+
+def weather_transport(latency: float) -> httpx.AsyncBaseTransport:
+    """Mock OpenWeather geocoding and 5-day forecast endpoints."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.startswith("/geo/"):
+            return httpx.Response(200, json=[{"lat": 45.0, "lon": 9.0}])
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        return httpx.Response(200, json={"list": [{
+            "dt_txt": (start + timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": 21.5 + i % 4, "feels_like": 21.0 + i % 4, "humidity": 55},
+            "weather": [{"main": "Clouds", "description": "scattered clouds"}],
+            "wind": {"speed": 3.4},
+            "pop": 0.1 * (i % 3),
+        } for i in range(40)]})
+    return httpx.MockTransport(handler)
+
+def _race_from_text(text: str) -> Dict[str, Any]:
+    year_match = re.search(r"\b(19[5-9]\d|20\d{2})\b", text)
+    year = int(year_match.group(1)) if year_match else datetime.now().year
+    lowered = text.lower()
+    for name, location, country, _ in CALENDAR:
+        if name.split(" Grand Prix")[0].lower() in lowered or location.lower() in lowered:
+            break
+    else:
+        name, location, country, _ = CALENDAR[7]
+    return {
+        "name": name,
+        "year": year,
+        "circuit_id": name.lower().replace(" grand prix", "").replace(" ", "_"),
+        "location": location,
+        "country": country,
+    }
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers planner and synthesizer prompts after a fixed latency.
+    
+    Streaming spreads the latency across chunks and reports tokens through
+    the callback manager, so LangGraph's "messages" stream mode sees them.
+    """
+    
+    latency: float = 1.0
+    chunks: int = 40
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-f1-briefing"
+    
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[0].content)
+        query = str(messages[-1].content)
+        if "briefing planner" in prompt:
+            return json.dumps({
+                "race_info": _race_from_text(query),
+                "tasks": ["get_track_info", "get_season_standings", "get_circuit_winners", "get_grid_form",
+                          "search_f1_news", "get_race_weather", "get_race_pace", "get_qualifying_pace"]
+            })
+        words = (f"{query}. " + "Offline benchmark briefing text with track, standings, history, "
+                 "news and weather sections. " * 12).split()
+        return " ".join(words)
+    
+    def _usage(self, messages: List[BaseMessage], text: str) -> Dict[str, int]:
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(text) // 4
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens}
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        text = self._reply(messages)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        text = self._reply(messages)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _pieces(self, text: str) -> Iterator[str]:
+        words = text.split(" ")
+        size = max(1, len(words) // self.chunks)
+        for i in range(0, len(words), size):
+            yield " ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+    
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._reply(messages)
+        pieces = list(self._pieces(text))
+        usage = self._usage(messages, text)
+        for i, piece in enumerate(pieces):
+            await asyncio.sleep(self.latency / len(pieces))
+            last = i == len(pieces) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=piece,
+                usage_metadata=usage if last else None
+            ))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+def install(llm_latency: float = 1.0, session_latency: float = 0.5, news_latency: float = 0.3,
+            weather_latency: float = 0.2) -> None:
+    """Replace the LLM and all data sources with offline fakes. Call before the first request."""
+    from agent import graph
+    from tools import news_client, weather_client
+    
+    install_fastf1(session_latency)
+    graph.set_llm(FakeChatModel(latency=llm_latency))
+    news_client.set_backend(news_client.FakeSearchBackend(latency=news_latency))
+    weather_client.set_transport(weather_transport(weather_latency))
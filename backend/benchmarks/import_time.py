@@ -0,0 +1,98 @@
+"""Check that importing the API stays within a startup time budget.
+
+Each sample imports ``main`` in a fresh interpreter, so nothing is shared
+through sys.modules or warm bytecode beyond what a real process start sees.
+The heavy agent stack must not load at import time; it is loaded by the app
+lifespan instead. Exits non-zero when the median import time exceeds the
+budget, so this can run in CI.
+
+Usage (from backend/):
+    python benchmarks/import_time.py [--budget 1.5] [--runs 5] [--profile]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.5"))
+
+# Modules that must not be imported by ``import main``
+HEAVY_MODULES = ["fastf1", "pandas", "langgraph", "langchain_anthropic", "agent.graph"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # main exits without an API key; the key is never used at import time
+    if not env.get("ANTHROPIC_API_KEY") or env["ANTHROPIC_API_KEY"].startswith("sk-ant-your"):
+        env["ANTHROPIC_API_KEY"] = "sk-ant-import-benchmark"
+    return env
+
+def measure_once() -> dict:
+    """Import main in a fresh interpreter and return its timing and heavy modules loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % HEAVY_MODULES],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def profile() -> None:
+    """Print the slowest imports reported by ``python -X importtime``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    print("Slowest imports (cumulative):")
+    for micros, name in sorted(rows, reverse=True)[:20]:
+        print(f"  {micros / 1e6:7.3f}s {name}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="median import budget in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="also print the slowest imports")
+    args = parser.parse_args()
+    
+    samples = [measure_once() for _ in range(args.runs)]
+    seconds = [s["seconds"] for s in samples]
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+    median = statistics.median(seconds)
+    
+    print(json.dumps({
+        "runs": args.runs,
+        "median_seconds": round(median, 3),
+        "max_seconds": round(max(seconds), 3),
+        "budget_seconds": args.budget,
+        "heavy_modules_loaded": loaded
+    }, indent=2))
+    
+    if args.profile:
+        profile()
+    
+    if loaded:
+        print(f"FAIL: heavy modules imported by main: {', '.join(loaded)}")
+        return 1
+    if median > args.budget:
+        print(f"FAIL: median import time {median:.3f}s exceeds budget {args.budget:.3f}s")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""Offline throughput benchmark for the briefing pipeline.
+
+Replays a weighted mix of briefing queries against the compiled LangGraph
+agent and the FastAPI routes, with the LLM, FastF1, Tavily and OpenWeather
+replaced by the fakes in benchmarks/fakes.py. Every (scenario, concurrency)
+pair runs in a fresh interpreter so caches and peak RSS are measured per
+scenario. Results are written as JSON; pass --compare with an earlier file
+to flag p95 or throughput regressions.
+
+Scenarios:
+    graph          agent.ainvoke directly, planner included
+    api            POST /api/briefing, briefing cache enabled
+    api-uncached   POST /api/briefing, finished briefings not reused
+    api-stream     POST /api/briefing/stream, also reports time to first token
+
+Usage (from backend/):
+    python benchmarks/pipeline.py --concurrency 1,8,32 --requests 64
+    python benchmarks/pipeline.py --scenario api --compare benchmarks/results/previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+SCENARIOS = ["graph", "api", "api-uncached", "api-stream"]
+
+# Weighted query mix: mostly names the local resolver handles, plus a few the planner LLM must parse
+QUERY_MIX = [
+    ("Monaco GP", 8),
+    ("British Grand Prix", 6),
+    ("Italian GP", 5),
+    ("Silverstone", 4),
+    ("Japanese Grand Prix", 4),
+    ("Las Vegas", 3),
+    ("Spa", 3),
+    ("Singapore Grand Prix", 3),
+    ("Abu Dhabi GP", 2),
+    ("Brazil", 2),
+    ("COTA", 2),
+    ("the night race around the harbour in monaco", 1),
+    ("whatever's on at zandvoort this year", 1),
+]
+
+# Environment applied to worker processes before any backend module is imported
+SCENARIO_ENV = {
+    "api-uncached": {"BRIEFING_CACHE_TTL_SECONDS": "0", "INCREMENTAL_REFRESH": "false"},
+}
+
+def query_sequence(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    queries, weights = zip(*QUERY_MIX)
+    return rng.choices(queries, weights=weights, k=count)
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def summarize(latencies: List[float], wall: float) -> Dict[str, Any]:
+    from api.scheduler import percentile
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+        "rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "wall_seconds": round(wall, 3),
+    }
+
+def initial_state(query: str) -> Dict[str, Any]:
+    return {
+        "messages": [],
+        "race_query": query,
+        "race_info": None,
+        "tasks": [],
+        "tool_results": [],
+        "briefing": None,
+        "current_step": "planning",
+        "timings": {}
+    }
+
+async def run_scenario(scenario: str, queries: List[str], concurrency: int) -> Dict[str, Any]:
+    """Send every query with at most ``concurrency`` in flight; return latency stats."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    first_token: List[float] = []
+    errors: List[str] = []
+    
+    if scenario == "graph":
+        from agent.graph import get_agents
+        agent = get_agents()[0]
+        
+        async def one(query: str) -> None:
+            result = await agent.ainvoke(initial_state(query))
+            if not result.get("briefing") or result.get("current_step") == "error":
+                raise RuntimeError(result.get("briefing") or "no briefing")
+    else:
+        import httpx
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300)
+        
+        async def one(query: str) -> None:
+            if scenario != "api-stream":
+                response = await client.post("/api/briefing", json={"query": query})
+                response.raise_for_status()
+                return
+            started = time.perf_counter()
+            seen_delta = False
+            async with client.stream("POST", "/api/briefing/stream", json={"query": query}) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("event:"):
+                        continue
+                    event = line.split(":", 1)[1].strip()
+                    if event == "briefing_delta" and not seen_delta:
+                        first_token.append(time.perf_counter() - started)
+                        seen_delta = True
+                    elif event == "error":
+                        raise RuntimeError("stream reported an error event")
+                    elif event == "complete":
+                        return
+            raise RuntimeError("stream ended without a complete event")
+    
+    async def timed(query: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await one(query)
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(f"{query}: {type(e).__name__}: {e}")
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(q) for q in queries))
+    wall = time.perf_counter() - started
+    
+    stats = summarize(latencies, wall)
+    if first_token:
+        from api.scheduler import percentile
+        stats["ttft_p50_ms"] = round(percentile(first_token, 0.50) * 1000, 1)
+        stats["ttft_p95_ms"] = round(percentile(first_token, 0.95) * 1000, 1)
+    stats.update(ok=len(latencies), errors=len(errors), error_samples=errors[:5])
+    return stats
+
+def worker(args: argparse.Namespace) -> None:
+    """Run a single scenario in this process and print its result as JSON."""
+    sys.path.insert(0, BACKEND_DIR)
+    from benchmarks import fakes
+    fakes.install(
+        llm_latency=args.llm_latency,
+        session_latency=args.session_latency,
+        news_latency=args.news_latency,
+        weather_latency=args.weather_latency
+    )
+    queries = query_sequence(args.requests, args.seed)
+    stats = asyncio.run(run_scenario(args.scenario, queries, args.concurrency))
+    stats.update(scenario=args.scenario, concurrency=args.concurrency, requests=args.requests,
+                 peak_rss_mb=round(peak_rss_mb(), 1))
+    print(json.dumps(stats))
+
+def spawn(args: argparse.Namespace, scenario: str, concurrency: int) -> Dict[str, Any]:
+    scratch = tempfile.mkdtemp(prefix="f1-bench-")
+    env = {
+        **os.environ,
+        "ANTHROPIC_API_KEY": os.environ.get("ANTHROPIC_API_KEY") or "sk-ant-offline-benchmark",
+        "OPENWEATHER_API_KEY": "offline-benchmark",
+        "NEWS_BACKEND": "fake",
+        "WARMUP_ENABLED": "false",
+        "FASTF1_CACHE_DIR": os.path.join(scratch, "fastf1"),
+        "GEOCODE_CACHE_FILE": os.path.join(scratch, "geocode.json"),
+        "BRIEFING_QUEUE_SIZE": str(max(16, args.requests)),
+        **SCENARIO_ENV.get(scenario, {}),
+    }
+    command = [
+        sys.executable, os.path.abspath(__file__), "--worker",
+        "--scenario", scenario, "--concurrency", str(concurrency), "--requests", str(args.requests),
+        "--seed", str(args.seed), "--llm-latency", str(args.llm_latency),
+        "--session-latency", str(args.session_latency), "--news-latency", str(args.news_latency),
+        "--weather-latency", str(args.weather_latency),
+    ]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode != 0 or not lines:
+        return {"scenario": scenario, "concurrency": concurrency, "failed": True,
+                "stderr": completed.stderr[-2000:]}
+    return json.loads(lines[-1])
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(current: List[Dict[str, Any]], previous_path: str, tolerance: float) -> bool:
+    """Print p95 and RPS changes against a previous run; True if any scenario regressed."""
+    with open(previous_path) as f:
+        previous = {(r["scenario"], r["concurrency"]): r for r in json.load(f)["results"] if not r.get("failed")}
+    regressed = False
+    print(f"\nCompared with {previous_path} (tolerance {tolerance:.0%}):")
+    for result in current:
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if before is None or result.get("failed"):
+            continue
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        flag = p95_change > tolerance or rps_change < -tolerance
+        regressed = regressed or flag
+        print(f"  {result['scenario']:<13} c={result['concurrency']:<3} "
+              f"p95 {p95_change:+.1%}  rps {rps_change:+.1%}{'  REGRESSION' if flag else ''}")
+    return regressed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline briefing pipeline benchmark")
+    parser.add_argument("--scenario", default="all", help=f"one of {', '.join(SCENARIOS)} or 'all'")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="requests per scenario")
+    parser.add_argument("--seed", type=int, default=7, help="seed for the query mix")
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--session-latency", type=float, default=0.5)
+    parser.add_argument("--news-latency", type=float, default=0.3)
+    parser.add_argument("--weather-latency", type=float, default=0.2)
+    parser.add_argument("--output", help="results file (default benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p95/RPS change before flagging")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        args.concurrency = int(args.concurrency)
+        worker(args)
+        return 0
+    
+    scenarios = SCENARIOS if args.scenario == "all" else args.scenario.split(",")
+    levels = [int(c) for c in args.concurrency.split(",")]
+    
+    results = []
+    for scenario in scenarios:
+        for concurrency in levels:
+            result = spawn(args, scenario, concurrency)
+            results.append(result)
+            if result.get("failed"):
+                print(f"{scenario:<13} c={concurrency:<3} FAILED\n{result['stderr']}")
+                continue
+            print(f"{scenario:<13} c={concurrency:<3} p50 {result['p50_ms']:>8.1f}ms  p95 {result['p95_ms']:>8.1f}ms  "
+                  f"p99 {result['p99_ms']:>8.1f}ms  {result['rps']:>7.2f} rps  "
+                  f"rss {result['peak_rss_mb']:>6.1f}MB  errors {result['errors']}")
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "settings": {
+                "requests": args.requests,
+                "seed": args.seed,
+                "llm_latency": args.llm_latency,
+                "session_latency": args.session_latency,
+                "news_latency": args.news_latency,
+                "weather_latency": args.weather_latency,
+            },
+            "results": results
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+    
+    failed = any(r.get("failed") for r in results)
+    if args.compare and compare(results, args.compare, args.tolerance):
+        return 1
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
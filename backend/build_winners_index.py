@@ -0,0 +1,35 @@
+"""Build the on-disk podium index used by get_circuit_winners.
+
+Indexes every completed round from WINNERS_FIRST_SEASON (or --first) through
+the current season. Seasons already marked complete are skipped, so
+re-running it only adds new rounds. The API server indexes on demand and
+never walks whole seasons itself.
+
+Usage (from backend/):
+    python build_winners_index.py
+    python build_winners_index.py --first 2010
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from tools import winners_index
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the circuit podium index")
+    parser.add_argument("--first", type=int, default=winners_index.WINNERS_FIRST_SEASON,
+                        help="first season to index")
+    parser.add_argument("--last", type=int, default=datetime.now().year, help="last season to index")
+    args = parser.parse_args()
+    
+    winners_index.build(range(args.first, args.last + 1))
+    stats = winners_index.stats()
+    print(f"Winners index: {stats['rounds']} rounds, {stats['complete_seasons']} complete seasons", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
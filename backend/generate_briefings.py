@@ -0,0 +1,75 @@
+"""Generate briefings for many races from the command line.
+
+Runs the same batch pipeline as POST /api/briefing/batch in-process: plans
+every query, runs shared tool calls once and writes each briefing to the
+output directory as soon as it finishes.
+
+Usage (from backend/):
+    python generate_briefings.py --season 2025
+    python generate_briefings.py "Monaco GP 2025" "Silverstone 2025" --out briefings/
+    python generate_briefings.py --season 2025 --all-rounds --jsonl > briefings.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from api import batch
+
+def slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+async def generate(args: argparse.Namespace) -> int:
+    try:
+        queries = await batch.resolve_queries(args.queries, args.season, not args.all_rounds)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    if not args.jsonl:
+        os.makedirs(args.out, exist_ok=True)
+    print(f"Generating {len(queries)} briefings", file=sys.stderr)
+    
+    failed = 0
+    async for item in batch.run_batch(queries):
+        kind = item["type"]
+        if kind == "data":
+            print(f"Data phase: {item['unique_tool_calls']} tool calls for {item['tool_calls']} planned "
+                  f"({item['failed_tool_calls']} failed) in {item['elapsed_ms'] / 1000:.1f}s", file=sys.stderr)
+        elif kind == "failed":
+            failed += 1
+            print(f"[{item['index'] + 1}/{len(queries)}] FAILED {item['query']}: {item['message']}", file=sys.stderr)
+        elif kind == "briefing":
+            race = item["race"]
+            if args.jsonl:
+                print(json.dumps({k: v for k, v in item.items() if k != "tool_results"}, default=str), flush=True)
+                destination = "stdout"
+            else:
+                destination = os.path.join(args.out, f"{race['year']}-{slug(race['name'])}.md")
+                with open(destination, "w", encoding="utf-8") as f:
+                    f.write(item["briefing"])
+            print(f"[{item['index'] + 1}/{len(queries)}] {race['name']} {race['year']} -> {destination}", file=sys.stderr)
+        elif kind == "complete":
+            print(f"Done: {item['succeeded']} succeeded, {item['failed']} failed "
+                  f"in {item['elapsed_ms'] / 1000:.1f}s", file=sys.stderr)
+    
+    return 1 if failed else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate race briefings in bulk")
+    parser.add_argument("queries", nargs="*", help="race queries, e.g. 'Monaco GP 2025'")
+    parser.add_argument("--season", type=int, help="add every remaining race of this season")
+    parser.add_argument("--all-rounds", action="store_true", help="with --season, include races already run")
+    parser.add_argument("--out", default="briefings", help="directory for Markdown briefings")
+    parser.add_argument("--jsonl", action="store_true", help="write briefings to stdout as JSON lines instead")
+    args = parser.parse_args()
+    return asyncio.run(generate(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
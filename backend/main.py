@@ -1,8 +1,10 @@
+import asyncio
 import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import fastf1
 
 load_dotenv()
 
@@ -26,17 +28,32 @@ if not openweather_key or openweather_key == "your-openweather-api-key-here":
 
 print("Environment variables loaded successfully")
 
-cache_dir = 'cache/'
-if not os.path.exists(cache_dir):
-    os.makedirs(cache_dir)
-fastf1.Cache.enable_cache(cache_dir)
-
+from api import runtime
 from api.routes import router
 
+async def start_warmup():
+    """Warm schedules, results and news once the agent stack has loaded."""
+    try:
+        stack = await runtime.get()
+    except Exception:
+        return
+    stack.warmup.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy imports and graph compilation happen off the startup path
+    runtime.start()
+    warmup_task = asyncio.create_task(start_warmup())
+    yield
+    warmup_task.cancel()
+    if "tools.weather_client" in sys.modules:
+        await sys.modules["tools.weather_client"].aclose()
+
 app = FastAPI(
     title="F1 Briefing Agent API",
     description="AI-powered F1 race weekend briefing generator",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
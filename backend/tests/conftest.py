@@ -0,0 +1,40 @@
+"""Shared test setup: make the backend packages importable and keep everything offline."""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("DERIVED_STORE_ENABLED", "false")
+
+@pytest.fixture
+def canned_f1(monkeypatch):
+    """FastF1 schedules and sessions served from benchmarks.fakes, starting from empty caches."""
+    import fastf1
+    from benchmarks import fakes
+    from tools import schedule_cache, season_store, session_loader
+    
+    monkeypatch.setattr(fastf1, "get_event_schedule", lambda year, **kwargs: fakes.canned_schedule(year))
+    monkeypatch.setattr(fastf1, "get_session", lambda year, event, name: fakes.CannedSession(year, event, name, 0))
+    monkeypatch.setattr(season_store, "_frames", {})
+    monkeypatch.setattr(season_store, "_loaded", {})
+    schedule_cache.clear()
+    session_loader.clear()
+    yield fakes
+    schedule_cache.clear()
+    session_loader.clear()
+
+@pytest.fixture
+def fake_llm():
+    """Planner and synthesizer answered by the benchmark's fake chat model; the real one is restored after."""
+    from agent import graph
+    from benchmarks.fakes import FakeChatModel
+    
+    previous = graph._llm
+    llm = FakeChatModel(latency=0.01, chunks=2)
+    graph.set_llm(llm)
+    yield llm
+    graph.set_llm(previous)
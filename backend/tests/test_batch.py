@@ -0,0 +1,83 @@
+"""Batch data phase: admission, tool concurrency and the tool deadline."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent import graph
+from api import batch, runtime
+from api.scheduler import JobScheduler, SchedulerSaturated
+
+RACES = {
+    "Monaco 2025": {"name": "Monaco Grand Prix", "year": 2025, "circuit_id": "monaco",
+                    "location": "Monaco", "country": "Monaco"},
+    "Monza 2025": {"name": "Italian Grand Prix", "year": 2025, "circuit_id": "monza",
+                   "location": "Monza", "country": "Italy"},
+}
+TASKS = ["get_track_info", "get_season_standings", "get_circuit_info"]
+
+@pytest.fixture
+def batch_graph(monkeypatch):
+    """Planner, tools and synthesizer replaced by fakes; records tool concurrency."""
+    calls = {"running": 0, "peak": 0, "count": 0}
+    
+    async def get():
+        return SimpleNamespace(graph=graph)
+    
+    async def planner_node(state):
+        return {"race_info": RACES[state["race_query"]], "tasks": list(TASKS), "current_step": "gathering"}
+    
+    async def invoke_tool(task_name, args):
+        calls["count"] += 1
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        try:
+            slow = task_name == "get_track_info" and args["circuit_name"] == "Monaco Grand Prix"
+            await asyncio.sleep(5 if slow else 0.02)
+            return {"tool_name": task_name, "success": True, "data": {"ok": True}}
+        finally:
+            calls["running"] -= 1
+    
+    async def synthesizer_node(state):
+        return {"briefing": "Briefing", "current_step": "complete", "timings": {}}
+    
+    monkeypatch.setattr(runtime, "get", get)
+    monkeypatch.setattr(graph, "planner_node", planner_node)
+    monkeypatch.setattr(graph, "invoke_tool", invoke_tool)
+    monkeypatch.setattr(graph, "synthesizer_node", synthesizer_node)
+    monkeypatch.setattr(graph, "TOOL_DEADLINE", 0.5)
+    monkeypatch.setattr(batch, "BATCH_TOOL_CONCURRENCY", 2)
+    return calls
+
+async def collect(queries):
+    return [item async for item in batch.run_batch(queries)]
+
+def test_data_phase_is_bounded_and_cut_off_at_the_deadline(batch_graph, monkeypatch):
+    async def scenario():
+        scheduler = JobScheduler()
+        monkeypatch.setattr(batch, "job_scheduler", scheduler)
+        items = await collect(list(RACES))
+        return scheduler, items
+    
+    scheduler, items = asyncio.run(scenario())
+    data = next(item for item in items if item["type"] == "data")
+    
+    assert data["unique_tool_calls"] == 5
+    assert data["failed_tool_calls"] == 1
+    assert data["elapsed_ms"] < 2000
+    assert batch_graph["peak"] == 2
+    assert items[-1]["type"] == "complete" and items[-1]["succeeded"] == 2
+    assert scheduler.completed == 1 and scheduler.queued == 0 and scheduler.active == 0
+
+def test_saturated_scheduler_rejects_the_data_phase(batch_graph, monkeypatch):
+    async def scenario():
+        scheduler = JobScheduler(max_workers=1, max_queue=0)
+        scheduler.active = 1
+        monkeypatch.setattr(batch, "job_scheduler", scheduler)
+        with pytest.raises(SchedulerSaturated):
+            await collect(list(RACES))
+        return scheduler
+    
+    scheduler = asyncio.run(scenario())
+    assert scheduler.rejected == 1 and scheduler.queued == 0
+    assert batch_graph["count"] == 0
@@ -0,0 +1,93 @@
+"""Briefing cache: single flight, TTL, eviction and cancellation."""
+import asyncio
+import time
+
+import pytest
+
+from api.briefing_cache import BriefingCache
+from api.scheduler import SchedulerSaturated
+
+def starter(started, release=None, result=None):
+    async def start(run):
+        started.append(run)
+        if release is not None:
+            await release.wait()
+        run.finish(result or {"briefing": f"Briefing {len(started)}"})
+    return start
+
+def test_identical_requests_share_one_run():
+    async def scenario():
+        cache = BriefingCache()
+        started, release = [], asyncio.Event()
+        first = cache.get_or_start("key", starter(started, release))
+        second = cache.get_or_start("key", starter(started, release))
+        release.set()
+        await asyncio.gather(first.wait(), second.wait())
+        third = cache.get_or_start("key", starter(started))
+        return cache, started, first, second, third
+    
+    cache, started, first, second, third = asyncio.run(scenario())
+    assert first is second is third
+    assert len(started) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_expired_run_is_replaced():
+    async def scenario():
+        cache = BriefingCache(ttl=60)
+        started = []
+        first = cache.get_or_start("key", starter(started))
+        await first.wait()
+        first.finished_at = time.monotonic() - 61
+        second = cache.get_or_start("key", starter(started))
+        await second.wait()
+        return first, second, started
+    
+    first, second, started = asyncio.run(scenario())
+    assert first is not second
+    assert len(started) == 2
+
+def test_expired_result_survives_rejected_admission():
+    async def scenario():
+        cache = BriefingCache(ttl=60)
+        first = cache.get_or_start("key", starter([], result={"briefing": "Old"}))
+        await first.wait()
+        first.finished_at = time.monotonic() - 61
+        
+        def admit():
+            raise SchedulerSaturated(5)
+        
+        with pytest.raises(SchedulerSaturated):
+            cache.get_or_start("key", starter([]), admit=admit)
+        return cache
+    
+    cache = asyncio.run(scenario())
+    assert cache.latest_result("key") == {"briefing": "Old"}
+
+def test_eviction_keeps_in_flight_runs():
+    async def scenario():
+        cache = BriefingCache(max_entries=1)
+        started, release = [], asyncio.Event()
+        in_flight = cache.get_or_start("a", starter(started, release))
+        cache.get_or_start("b", starter(started, release))
+        again = cache.get_or_start("a", starter(started, release))
+        release.set()
+        await in_flight.wait()
+        return in_flight, again, started
+    
+    in_flight, again, started = asyncio.run(scenario())
+    assert again is in_flight
+    assert len(started) == 2
+
+def test_run_cancelled_before_it_starts_finishes_and_is_evicted():
+    async def scenario():
+        cache = BriefingCache()
+        started = []
+        run = cache.get_or_start("key", starter(started))
+        run.cancel()
+        await asyncio.wait_for(run.wait(), 1)
+        return cache, run, started
+    
+    cache, run, started = asyncio.run(scenario())
+    assert started == []
+    assert run.error == "Briefing run was cancelled"
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,35 @@
+"""Compact rendering of tool payloads for the synthesizer prompt."""
+from agent import compaction
+from agent.compaction import compact_tool_result, estimate_tokens
+
+def test_records_render_as_a_table_without_pruned_fields():
+    text = compact_tool_result({
+        "tool_name": "search_f1_news",
+        "success": True,
+        "data": {
+            "query": "Monaco 2025",
+            "articles": [
+                {"title": "Pole | lap", "url": "https://example.com/1", "content": "Short", "score": 0.9},
+                {"title": "Upgrades", "url": "https://example.com/2", "content": "x " * 400, "score": 0.8},
+            ]
+        }
+    })
+    lines = text.splitlines()
+    
+    assert lines[0] == "### search_f1_news (ok)"
+    assert lines[2].strip() == "title | content"
+    assert lines[3].strip() == "Pole / lap | Short"
+    assert "url" not in text and "score" not in text and "query" not in text
+    assert lines[4].endswith("…") and len(lines[4]) < compaction.SNIPPET_CHARS + 20
+
+def test_long_payloads_are_held_to_the_tool_budget():
+    rows = [{"driver": f"D{i}", "points": i * 1.25} for i in range(500)]
+    text = compact_tool_result({"tool_name": "get_season_standings", "success": True, "data": {"standings": rows}})
+    
+    assert estimate_tokens(text) <= compaction.TOOL_TOKEN_BUDGET + 10
+    assert text.splitlines()[-1].endswith("more lines omitted)")
+    assert "D0 | 0\n" in text and "D1 | 1.2" in text
+
+def test_failed_result_keeps_only_the_error():
+    text = compact_tool_result({"tool_name": "get_race_weather", "success": False, "data": {"error": "timed out"}})
+    assert text == "### get_race_weather (failed)\nerror: timed out"
@@ -0,0 +1,36 @@
+"""Shared derived store: compute once, skip unpublished values, versioned entries."""
+import threading
+
+import pytest
+
+from tools import derived_store
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(derived_store, "DERIVED_STORE_ENABLED", True)
+    monkeypatch.setattr(derived_store, "DERIVED_STORE_FILE", str(tmp_path / "derived.sqlite"))
+    monkeypatch.setattr(derived_store, "_local", threading.local())
+    return derived_store
+
+def test_value_is_computed_once(store):
+    computed = []
+    
+    def compute():
+        computed.append(1)
+        return {"points": [25, 18, 15]}
+    
+    assert store.get_or_compute(2023, 1, "standings", compute) == {"points": [25, 18, 15]}
+    assert store.get_or_compute(2023, 1, "standings", compute) == {"points": [25, 18, 15]}
+    assert len(computed) == 1
+
+def test_values_rejected_by_keep_are_not_stored(store):
+    store.get_or_compute(2023, 2, "results:R", lambda: [], keep=bool)
+    assert store.get(2023, 2, "results:R") is None
+
+def test_version_bump_makes_entries_stale(store, monkeypatch):
+    store.put(2023, 3, "pace:R", {"pace": 1})
+    monkeypatch.setitem(store.KIND_VERSIONS, "pace", store.KIND_VERSIONS["pace"] + 1)
+    
+    assert store.get(2023, 3, "pace:R") is None
+    assert store.purge_stale() == 1
+    assert store.stats()["kinds"] == {}
@@ -0,0 +1,32 @@
+"""Vectorized pace analysis on canned laps."""
+import fastf1
+
+from tools import lap_analytics
+
+YEAR = 2023
+
+def test_race_pace_orders_long_runs_and_loads_no_weather(canned_f1, monkeypatch):
+    loads = []
+    
+    class RecordedSession(canned_f1.CannedSession):
+        def load(self, **kwargs) -> None:
+            loads.append(kwargs)
+            super().load(**kwargs)
+    
+    monkeypatch.setattr(fastf1, "get_session", lambda year, event, name: RecordedSession(year, event, name, 0))
+    pace = lap_analytics.session_pace(YEAR, canned_f1.CALENDAR[0][0], 'R')
+    
+    assert loads == [{"laps": True, "telemetry": False, "weather": False, "messages": False}]
+    long_runs = pace["long_run_pace"]
+    assert long_runs[0]["gap_ms"] == 0
+    assert [row["pace_s"] for row in long_runs] == sorted(row["pace_s"] for row in long_runs)
+    # Canned laps lose about 0.06s per lap of tyre age, less 0.03s of fuel burn
+    assert all(20 <= row["deg_ms_per_lap"] <= 45 for row in long_runs)
+    assert {row["compound"] for row in pace["compound_degradation"]} == {"SOFT", "MEDIUM", "HARD"}
+
+def test_qualifying_gaps_are_relative_to_pole(canned_f1):
+    gaps = lap_analytics.session_pace(YEAR, canned_f1.CALENDAR[0][0], 'Q')["qualifying_gaps"]
+    
+    assert gaps[0]["gap_ms"] == 0
+    assert all(a["gap_ms"] <= b["gap_ms"] for a, b in zip(gaps, gaps[1:]))
+    assert all(row["ideal_gain_ms"] >= 0 for row in gaps)
@@ -0,0 +1,25 @@
+"""News cache: concurrent misses share one search, and importing stays light."""
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from tools import news_client
+from conftest import BACKEND_DIR
+
+def test_concurrent_misses_make_one_search():
+    backend = news_client.FakeSearchBackend(latency=0.3)
+    news_client.set_backend(backend)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(lambda _: news_client.search("Monaco GP 2025"), range(4)))
+    finally:
+        news_client.set_backend(news_client.FakeSearchBackend())
+    
+    assert backend.calls == 1
+    assert all(response is responses[0] for response in responses)
+    assert news_client._inflight == {}
+
+def test_import_does_not_load_fastf1():
+    check = "import sys, tools.news_client; print('fastf1' in sys.modules or 'pandas' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", check], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,33 @@
+"""Local query resolution against the cached schedule."""
+from agent.resolver import resolve_query
+from tools import schedule_cache
+
+def test_exact_names_aliases_and_locations_resolve_confidently(canned_f1):
+    for query in ["Monaco 2023", "British GP 2023", "silverstone 2023", "Give me the Suzuka preview 2023"]:
+        race_info, confidence = resolve_query(query)
+        assert confidence == 1.0, query
+        assert race_info["year"] == 2023
+    
+    assert resolve_query("silverstone 2023")[0]["name"] == "British Grand Prix"
+    assert resolve_query("Sao Paulo 2023")[0]["name"] == "São Paulo Grand Prix"
+
+def test_partial_and_unknown_queries(canned_f1):
+    race_info, confidence = resolve_query("Emilia 2023")
+    assert race_info["name"] == "Emilia Romagna Grand Prix"
+    assert confidence == 0.5
+    
+    assert resolve_query("Nürburgring 2023") == (None, 0.0)
+    assert resolve_query("Pre-Season Testing 2023") == (None, 0.0)
+    assert resolve_query("2023") == (None, 0.0)
+
+def test_schedule_is_fetched_once_per_season(canned_f1, monkeypatch):
+    import fastf1
+    
+    fetches = []
+    monkeypatch.setattr(fastf1, "get_event_schedule",
+                        lambda year, **kwargs: fetches.append(year) or canned_f1.canned_schedule(year))
+    for query in ["Monaco 2023", "Monza 2023", "Baku 2023"]:
+        resolve_query(query)
+    
+    assert fetches == [2023]
+    assert schedule_cache.get_schedule(2023) is schedule_cache.get_schedule(2023)
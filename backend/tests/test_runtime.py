@@ -0,0 +1,30 @@
+"""Lazy loading of the agent stack."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from api import runtime
+
+def test_cancelled_caller_does_not_break_loading(monkeypatch):
+    def import_stack():
+        time.sleep(0.2)
+        return SimpleNamespace(name="stack")
+    
+    monkeypatch.setattr(runtime, "_import_stack", import_stack)
+    monkeypatch.setattr(runtime, "_future", None)
+    
+    async def scenario():
+        caller = asyncio.ensure_future(runtime.get())
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        
+        assert not runtime.is_ready()
+        assert runtime.status()["state"] == "loading"
+        
+        stack = await runtime.get()
+        assert stack.name == "stack"
+        assert runtime.is_ready()
+        assert runtime.status()["state"] == "ready"
+    
+    asyncio.run(scenario())
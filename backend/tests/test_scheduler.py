@@ -0,0 +1,67 @@
+"""Admission control: saturation, reservations and the non-streaming endpoint."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api import routes
+from api.scheduler import JobScheduler, SchedulerSaturated
+
+def test_full_queue_rejects_with_retry_after():
+    scheduler = JobScheduler(max_workers=1, max_queue=1)
+    scheduler.reserve()
+    scheduler.reserve()
+    
+    with pytest.raises(SchedulerSaturated) as rejected:
+        scheduler.reserve()
+    assert rejected.value.retry_after >= 1
+    assert (scheduler.queued, scheduler.rejected) == (2, 1)
+    
+    scheduler.release()
+    scheduler.reserve()
+    assert scheduler.queued == 2
+
+def test_reservations_are_returned_by_run_and_by_cancellation():
+    async def scenario():
+        scheduler = JobScheduler(max_workers=1, max_queue=4)
+        release = asyncio.Event()
+        
+        async def job():
+            await release.wait()
+            return "done"
+        
+        scheduler.reserve()
+        running = asyncio.ensure_future(scheduler.run(job))
+        scheduler.reserve()
+        waiting = asyncio.ensure_future(scheduler.run(job))
+        await asyncio.sleep(0)
+        assert (scheduler.active, scheduler.queued) == (1, 1)
+        
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queued == 0
+        
+        release.set()
+        assert await running == "done"
+        return scheduler
+    
+    scheduler = asyncio.run(scenario())
+    assert (scheduler.active, scheduler.queued, scheduler.completed) == (0, 0, 1)
+
+def test_saturated_briefing_skips_the_planner(monkeypatch):
+    planned = []
+    
+    async def plan_briefing(query):
+        planned.append(query)
+        return {}
+    
+    scheduler = JobScheduler(max_workers=1, max_queue=0)
+    scheduler.active = 1
+    monkeypatch.setattr(routes, "job_scheduler", scheduler)
+    monkeypatch.setattr(routes, "plan_briefing", plan_briefing)
+    
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(routes._generate_briefing(routes.BriefingRequest(query="Monaco 2025")))
+    assert rejected.value.status_code == 503
+    assert "Retry-After" in rejected.value.headers
+    assert planned == []
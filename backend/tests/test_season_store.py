@@ -0,0 +1,51 @@
+"""Season results store: standings and rounds whose results are not published yet."""
+import fastf1
+import pandas as pd
+
+from tools import schedule_cache, season_store, session_loader
+
+YEAR = 2023
+
+def test_standings_total_every_completed_session(canned_f1):
+    results = season_store.get_season_results(YEAR)
+    standings = season_store.get_standings(YEAR)
+    
+    assert results['Round'].nunique() == len(canned_f1.CALENDAR)
+    assert standings['Points'].sum() == results['Points'].sum()
+    assert standings['Points'].is_monotonic_decreasing
+    leader = standings.iloc[0]
+    assert leader['Points'] == results[results['Abbreviation'] == leader['Abbreviation']]['Points'].sum()
+
+def test_unpublished_round_is_loaded_again(canned_f1, monkeypatch):
+    loads = []
+    
+    class LateSession(canned_f1.CannedSession):
+        def load(self, **kwargs) -> None:
+            # The first load happens before FastF1 has the results
+            loads.append(self.name)
+            if len(loads) > 1:
+                super().load(**kwargs)
+    
+    monkeypatch.setattr(fastf1, "get_session", lambda year, event, name: LateSession(year, event, name, 0))
+    schedule = schedule_cache.get_schedule(YEAR)
+    first_round = schedule[schedule['RoundNumber'] == 1]
+    
+    assert season_store.load_rounds(YEAR, first_round).empty
+    assert session_loader.stats()["entries"] == 0
+    
+    results = season_store.load_rounds(YEAR, first_round)
+    assert len(loads) == 2
+    assert not results.empty
+    assert session_loader.stats()["entries"] == 1
+
+def test_race_is_not_over_until_it_has_run():
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+    events = pd.DataFrame({
+        "RoundNumber": [1, 2, 3],
+        "EventDate": [now.normalize(), now.normalize(), now.normalize() - pd.Timedelta(days=1)],
+        "Session5": ["Race", "Race", "Race"],
+        "Session5DateUtc": [now - pd.Timedelta(hours=1), now - pd.Timedelta(hours=4), pd.NaT],
+    })
+    
+    assert schedule_cache.race_over(events).tolist() == [False, True, True]
+    assert not schedule_cache.race_over(events[["RoundNumber", "EventDate"]]).iloc[0]
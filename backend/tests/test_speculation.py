@@ -0,0 +1,47 @@
+"""Speculative tool calls are cancelled when a briefing never runs its tools."""
+import asyncio
+
+from agent import graph
+from api import routes
+from api.briefing_cache import BriefingCache, BriefingRun, make_key
+
+RACE_INFO = {
+    "name": "Monaco Grand Prix",
+    "year": 2025,
+    "circuit_id": "monaco",
+    "location": "Monaco",
+    "country": "Monaco"
+}
+TASKS = ["get_track_info", "get_season_standings"]
+
+def test_cache_hit_cancels_speculative_calls(monkeypatch):
+    async def scenario():
+        cache = BriefingCache()
+        monkeypatch.setattr(routes, "briefing_cache", cache)
+        
+        cached = BriefingRun()
+        cached.finish({"race_info": RACE_INFO, "briefing": "Cached briefing", "tool_results": []})
+        cache._runs[make_key(RACE_INFO, TASKS)] = cached
+        
+        speculative = [asyncio.ensure_future(asyncio.sleep(10)) for _ in TASKS]
+        graph._speculations["spec-1"] = {(task, "{}"): future for task, future in zip(TASKS, speculative)}
+        
+        state = {
+            "messages": [],
+            "race_query": "Monaco 2025",
+            "race_info": RACE_INFO,
+            "tasks": TASKS,
+            "tool_results": [],
+            "briefing": None,
+            "current_step": "gathering",
+            "speculation_id": "spec-1",
+            "timings": {}
+        }
+        run = routes.start_briefing(state)
+        await asyncio.sleep(0)
+        
+        assert run is cached
+        assert "spec-1" not in graph._speculations
+        assert all(future.cancelled() for future in speculative)
+    
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+"""Deadline handling in the tool executor node."""
+import asyncio
+
+from agent import graph
+from agent.state import ToolResult
+
+RACE_INFO = {
+    "name": "Monaco Grand Prix",
+    "year": 2025,
+    "circuit_id": "monaco",
+    "location": "Monaco",
+    "country": "Monaco"
+}
+
+def test_slow_tool_times_out_and_briefing_completes(monkeypatch, fake_llm):
+    async def run_tool(task_name: str, race_info) -> ToolResult:
+        await asyncio.sleep(3 if task_name == "get_track_info" else 0.01)
+        return ToolResult(tool_name=task_name, success=True, data={"ok": task_name})
+    
+    monkeypatch.setattr(graph, "run_tool", run_tool)
+    monkeypatch.setattr(graph, "TOOL_DEADLINE", 0.2)
+    
+    state = {
+        "messages": [],
+        "race_query": "Monaco 2025",
+        "race_info": RACE_INFO,
+        "tasks": ["get_track_info", "get_season_standings"],
+        "tool_results": [],
+        "briefing": None,
+        "current_step": "gathering",
+        "timings": {}
+    }
+    result = asyncio.run(graph.build_agents()[1].ainvoke(state))
+    
+    assert result["briefing"]
+    slow, fast = result["tool_results"]
+    assert slow["tool_name"] == "get_track_info"
+    assert not slow["success"]
+    assert "timed out" in slow["data"]["error"]
+    assert fast["success"]
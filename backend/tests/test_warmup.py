@@ -0,0 +1,19 @@
+"""Warm-up plan: only the upcoming races' past winners are indexed."""
+from datetime import datetime
+
+from tools import warmup, winners_index
+
+def test_warmup_indexes_only_upcoming_circuits(canned_f1, monkeypatch, tmp_path):
+    monkeypatch.setattr(winners_index, "WINNERS_INDEX_FILE", str(tmp_path / "winners.sqlite"))
+    monkeypatch.setattr(winners_index, "_initialized", False)
+    
+    steps = dict(warmup._plan(datetime.now().year))
+    winners_steps = [label for label in steps if label.endswith("past winners")]
+    
+    assert "winners index" not in steps
+    assert len(winners_steps) == warmup.WARMUP_UPCOMING
+    for label in winners_steps:
+        steps[label]()
+    stats = winners_index.stats()
+    assert 0 < stats["rounds"] <= warmup.WARMUP_UPCOMING * warmup.WINNERS_YEARS_BACK
+    assert stats["complete_seasons"] == 0
@@ -0,0 +1,25 @@
+"""Weather client: pooled HTTP client and caches across event loops."""
+import asyncio
+
+from benchmarks.fakes import weather_transport
+from tools import weather_client
+
+def test_client_works_from_successive_event_loops(monkeypatch, tmp_path):
+    monkeypatch.setattr(weather_client, "GEOCODE_CACHE_FILE", str(tmp_path / "geocode.json"))
+    weather_client.set_transport(weather_transport(0))
+    
+    async def lookup(*cities):
+        # Concurrent misses contend for the geocode lock, binding it to this loop
+        coordinates = await asyncio.gather(*(weather_client.get_coordinates(city, "XX", "key") for city in cities))
+        forecast = await weather_client.get_forecast(*coordinates[0], "key")
+        return coordinates, forecast, weather_client.get_client()
+    
+    try:
+        first = asyncio.run(lookup("Nowhere One", "Nowhere Two"))
+        second = asyncio.run(lookup("Nowhere Three", "Nowhere Four"))
+    finally:
+        weather_client.set_transport(None)
+    
+    assert first[0] == second[0] == [(45.0, 9.0), (45.0, 9.0)]
+    assert len(second[1]["list"]) == 40
+    assert first[2] is not second[2]
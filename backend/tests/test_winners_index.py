@@ -0,0 +1,31 @@
+"""Podium index: rounds without published results stay unindexed."""
+import fastf1
+
+from tools import winners_index
+
+YEAR = 2023
+
+def test_round_without_podium_is_not_indexed(canned_f1, monkeypatch, tmp_path):
+    monkeypatch.setattr(winners_index, "WINNERS_INDEX_FILE", str(tmp_path / "winners.sqlite"))
+    monkeypatch.setattr(winners_index, "_initialized", False)
+    published = {"results": False}
+    
+    class LateSession(canned_f1.CannedSession):
+        def load(self, **kwargs) -> None:
+            super().load(**kwargs)
+            # Before classification FastF1 knows the entry list but no positions
+            if not published["results"] and int(self.event['RoundNumber']) == 1:
+                self.results['Position'] = float('nan')
+    
+    monkeypatch.setattr(fastf1, "get_session", lambda year, event, name: LateSession(year, event, name, 0))
+    first_event = canned_f1.CALENDAR[0][0]
+    
+    winners_index.index_season(YEAR)
+    assert winners_index.stats() == {"rounds": len(canned_f1.CALENDAR) - 1, "complete_seasons": 0}
+    assert winners_index.circuit_podiums(first_event, [YEAR]).empty
+    
+    published["results"] = True
+    winners_index.index_season(YEAR)
+    assert winners_index.stats() == {"rounds": len(canned_f1.CALENDAR), "complete_seasons": 1}
+    podium = winners_index.circuit_podiums(first_event, [YEAR])
+    assert podium['position'].tolist() == [1, 2, 3]
@@ -0,0 +1,153 @@
+"""Process-shared cache of data derived from FastF1 sessions.
+
+Every uvicorn worker keeps its own in-memory stores, so without a shared
+layer each one reloads the same sessions and recomputes the same tables.
+This store keeps derived frames in one SQLite file in the shared cache
+directory, keyed by (year, round, kind). SQLite in WAL mode lets any number
+of worker processes read while one writes, and each write is a single
+atomic ``INSERT OR REPLACE``. Writers racing on the same key store the same
+content, so the last one simply wins.
+
+Entries carry the version of their kind from KIND_VERSIONS (plus the global
+DERIVED_STORE_VERSION). Bumping a version when the code producing a kind
+changes makes older entries misses; they are overwritten on the next write
+and can be purged with :func:`purge_stale`.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Callable, Dict, Optional
+
+from tools import fastf1_cache, metrics
+
+DERIVED_STORE_FILE = os.getenv("DERIVED_STORE_FILE", fastf1_cache.cache_path("derived.sqlite"))
+DERIVED_STORE_ENABLED = os.getenv("DERIVED_STORE_ENABLED", "true").lower() == "true"
+DERIVED_STORE_VERSION = int(os.getenv("DERIVED_STORE_VERSION", "1"))
+
+# Bump a kind's version whenever the code that derives it changes shape or meaning
+KIND_VERSIONS = {
+    "results": 1,
+    "standings": 1,
+    "pace": 1,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS derived (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (year, round, kind)
+);
+"""
+
+_local = threading.local()
+
+def _connection() -> sqlite3.Connection:
+    """One connection per thread; sqlite3 connections must not be shared across threads."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DERIVED_STORE_FILE) or ".", exist_ok=True)
+        conn = sqlite3.connect(DERIVED_STORE_FILE, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+def _version(kind: str) -> str:
+    base = kind.split(":", 1)[0]
+    return f"{DERIVED_STORE_VERSION}.{KIND_VERSIONS.get(base, 1)}"
+
+def get(year: int, round_number: int, kind: str) -> Optional[Any]:
+    """Stored value for a key at the current version, or None."""
+    if not DERIVED_STORE_ENABLED:
+        return None
+    try:
+        row = _connection().execute(
+            "SELECT payload FROM derived WHERE year = ? AND round = ? AND kind = ? AND version = ?",
+            (year, round_number, kind, _version(kind))
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Derived store: read failed for {year}/{round_number}/{kind}: {e}")
+        return None
+    if row is None:
+        metrics.cache_miss("derived")
+        return None
+    metrics.cache_hit("derived")
+    return pickle.loads(row[0])
+
+def put(year: int, round_number: int, kind: str, value: Any) -> None:
+    """Store a value under the current version, replacing any older entry."""
+    if not DERIVED_STORE_ENABLED:
+        return
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO derived VALUES (?, ?, ?, ?, ?, ?)",
+                (year, round_number, kind, _version(kind), time.time(), payload)
+            )
+    except sqlite3.Error as e:
+        print(f"Derived store: write failed for {year}/{round_number}/{kind}: {e}")
+
+def get_or_compute(year: int, round_number: int, kind: str, compute: Callable[[], Any],
+                   keep: Optional[Callable[[Any], bool]] = None) -> Any:
+    """Return the stored value for a key, computing it on a miss.
+    
+    The computed value is stored unless ``keep`` returns False for it, e.g.
+    for results that FastF1 has not published yet.
+    """
+    value = get(year, round_number, kind)
+    if value is None:
+        value = compute()
+        if keep is None or keep(value):
+            put(year, round_number, kind, value)
+    return value
+
+def invalidate(year: int, round_number: Optional[int] = None, kind: Optional[str] = None) -> int:
+    """Delete entries for a season, optionally narrowed to a round and kind. Returns rows removed."""
+    clauses, params = ["year = ?"], [year]
+    if round_number is not None:
+        clauses.append("round = ?")
+        params.append(round_number)
+    if kind is not None:
+        clauses.append("kind = ?")
+        params.append(kind)
+    conn = _connection()
+    with conn:
+        return conn.execute(f"DELETE FROM derived WHERE {' AND '.join(clauses)}", params).rowcount
+
+def purge_stale() -> int:
+    """Delete entries written under an outdated version. Returns rows removed."""
+    conn = _connection()
+    with conn:
+        stale = [
+            (year, round_number, kind)
+            for year, round_number, kind, version in conn.execute("SELECT year, round, kind, version FROM derived")
+            if version != _version(kind)
+        ]
+        conn.executemany("DELETE FROM derived WHERE year = ? AND round = ? AND kind = ?", stale)
+    return len(stale)
+
+def stats() -> Dict[str, Any]:
+    if not DERIVED_STORE_ENABLED:
+        return {"enabled": False}
+    if not os.path.exists(DERIVED_STORE_FILE):
+        return {"enabled": True, "file": DERIVED_STORE_FILE, "kinds": {}}
+    with closing(sqlite3.connect(DERIVED_STORE_FILE, timeout=5)) as conn:
+        try:
+            rows = conn.execute("SELECT kind, COUNT(*), SUM(LENGTH(payload)) FROM derived GROUP BY kind").fetchall()
+        except sqlite3.Error:
+            rows = []
+    return {
+        "enabled": True,
+        "file": DERIVED_STORE_FILE,
+        "kinds": {kind: {"entries": count, "bytes": size or 0} for kind, count, size in rows}
+    }
@@ -0,0 +1,83 @@
+"""Bounded thread executor for blocking FastF1 work called from async code.
+
+FastF1 session and schedule loads are synchronous and can take seconds, so
+async request handlers hand them to a dedicated pool instead of running them
+on the event loop. The pool reports its limit, queue depth and activity.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+class BoundedExecutor:
+    """Thread pool with a fixed worker count and queue/activity counters."""
+    
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` on the pool and await its result.
+        
+        Args:
+            fn: Blocking callable
+            timeout: Seconds allowed once the job has started running; time
+                spent waiting in the queue does not count
+        
+        Raises:
+            asyncio.TimeoutError: If the job runs longer than ``timeout``
+        """
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+        
+        def job():
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+            loop.call_soon_threadsafe(started.set)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+        
+        with self._lock:
+            self.queued += 1
+        concurrent_future = self._pool.submit(job)
+        
+        def on_done(f):
+            if f.cancelled():
+                with self._lock:
+                    self.queued -= 1
+        
+        concurrent_future.add_done_callback(on_done)
+        future = asyncio.wrap_future(concurrent_future)
+        
+        if timeout is None:
+            return await future
+        
+        try:
+            await started.wait()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        return await asyncio.wait_for(future, timeout)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed
+            }
+
+fastf1_executor = BoundedExecutor("fastf1", int(os.getenv("FASTF1_WORKERS", "4")))
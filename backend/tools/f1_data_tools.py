@@ -1,7 +1,9 @@
-import fastf1
 from langchain_core.tools import tool
+from datetime import datetime
 from typing import Dict, Any
 
+from tools import schedule_cache, season_store, winners_index
+
 @tool
 def get_season_standings(year: int) -> Dict[str, Any]:
     """Get championship standings for a specific season using FastF1 data.
@@ -13,87 +15,61 @@ def get_season_standings(year: int) -> Dict[str, Any]:
         Dictionary with driver standings or error message
     """
     try:
-        schedule = fastf1.get_event_schedule(year)
-        
-        # Get the most recent completed race
-        completed_events = schedule[schedule['EventDate'] < schedule.iloc[-1]['EventDate']]
+        standings = season_store.get_standings(year)
         
-        if completed_events.empty:
+        if standings.empty:
             return {"error": f"No completed races found for {year} season yet"}
         
-        # Get the last race to get current standings
-        last_event = completed_events.iloc[-1]
+        results = season_store.get_season_results(year)
         
-        try:
-            session = fastf1.get_session(year, last_event['EventName'], 'R')
-            session.load()
-            results = session.results
-            
-            # Aggregate points across season (simplified - just showing last race top 10)
-            driver_standings = []
-            for idx, row in results.head(10).iterrows():
-                driver_standings.append({
-                    "position": int(row['Position']) if row['Position'] > 0 else 'DNF',
-                    "driver": row['FullName'],
-                    "driver_code": row['Abbreviation'],
-                    "team": row['TeamName'],
-                    "points": float(row['Points'])
-                })
-            
-            return {
-                "year": year,
-                "last_race": last_event['EventName'],
-                "driver_standings": driver_standings,
-                "note": "Standings from most recent race"
-            }
-        except Exception as e:
-            return {"error": f"Could not load race data: {str(e)}"}
-            
+        driver_standings = []
+        for idx, row in standings.head(10).iterrows():
+            driver_standings.append({
+                "position": idx + 1,
+                "driver": row['FullName'],
+                "driver_code": row['Abbreviation'],
+                "team": row['TeamName'],
+                "points": float(row['Points']),
+                "wins": int(row['Wins'])
+            })
+        
+        return {
+            "year": year,
+            "last_race": results.iloc[-1]['EventName'],
+            "rounds_completed": int(results['Round'].nunique()),
+            "driver_standings": driver_standings,
+            "note": "Cumulative championship points including sprints"
+        }
     except Exception as e:
         return {"error": f"Failed to get season standings: {str(e)}"}
 
 @tool
 def get_circuit_winners(circuit_name: str, years_back: int = 3) -> Dict[str, Any]:
-    """Get recent winners at a specific circuit using FastF1.
+    """Get recent winners and podiums at a specific circuit using FastF1.
     
     Args:
         circuit_name: Name of the circuit/Grand Prix
-        years_back: Number of years to look back (default: 3)
+        years_back: Number of previous seasons to look back (default: 3)
     
     Returns:
         Dictionary with recent winners or error message
     """
     try:
-        current_year = 2025
-        winners = []
+        current_year = datetime.now().year
+        years = list(range(current_year - years_back, current_year))
+        podiums = winners_index.circuit_podiums(circuit_name, years)
         
-        for year in range(current_year - years_back, current_year):
-            try:
-                schedule = fastf1.get_event_schedule(year)
-                event = schedule[schedule['EventName'].str.contains(circuit_name, case=False, na=False)]
-                
-                if not event.empty:
-                    event_data = event.iloc[0]
-                    session = fastf1.get_session(year, event_data['EventName'], 'R')
-                    session.load()
-                    
-                    # Get the winner (Position 1)
-                    winner = session.results[session.results['Position'] == 1]
-                    
-                    if not winner.empty:
-                        winner_data = winner.iloc[0]
-                        time_val = winner_data.get('Time', 'N/A')
-                        time_str = str(time_val) if time_val != 'N/A' else 'N/A'
-                        
-                        winners.append({
-                            "year": year,
-                            "driver": winner_data['FullName'],
-                            "driver_code": winner_data['Abbreviation'],
-                            "team": winner_data['TeamName'],
-                            "time": time_str
-                        })
-            except:
-                continue
+        winners = []
+        for year, race in podiums.groupby('year', sort=False):
+            winner = race.iloc[0]
+            winners.append({
+                "year": int(year),
+                "driver": winner['driver'],
+                "driver_code": winner['driver_code'],
+                "team": winner['team'],
+                "time": winner['time'] or 'N/A',
+                "podium": race['driver_code'].tolist()
+            })
         
         return {
             "circuit": circuit_name,
@@ -114,13 +90,11 @@ def get_circuit_info(circuit_name: str, year: int = 2024) -> Dict[str, Any]:
         Dictionary with circuit information or error message
     """
     try:
-        schedule = fastf1.get_event_schedule(year)
-        event = schedule[schedule['EventName'].str.contains(circuit_name, case=False, na=False)]
+        event_data = schedule_cache.find_event(year, circuit_name)
         
-        if event.empty:
+        if event_data is None:
             return {"error": f"No event found for {circuit_name} in {year}"}
         
-        event_data = event.iloc[0]
         
         return {
             "circuit_name": event_data['EventName'],
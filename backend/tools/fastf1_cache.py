@@ -0,0 +1,30 @@
+"""Single place where the on-disk cache location is configured.
+
+FASTF1_CACHE_DIR defaults to ``backend/cache`` as an absolute path, so every
+worker process shares one FastF1 HTTP cache and one set of derived-data
+files no matter which directory it was started from. Importing this module
+does not import FastF1.
+"""
+import os
+import threading
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FASTF1_CACHE_DIR = os.path.abspath(os.getenv("FASTF1_CACHE_DIR", os.path.join(BACKEND_DIR, "cache")))
+
+_enabled = False
+_lock = threading.Lock()
+
+def cache_path(name: str) -> str:
+    """Path of a file inside the shared cache directory."""
+    return os.path.join(FASTF1_CACHE_DIR, name)
+
+def enable() -> None:
+    """Enable the FastF1 cache once per process; safe to call repeatedly."""
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        import fastf1
+        os.makedirs(FASTF1_CACHE_DIR, exist_ok=True)
+        fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
+        _enabled = True
@@ -1,12 +1,9 @@
-import fastf1
-import os
 from langchain_core.tools import tool
 from typing import Dict, Any
 
-cache_dir = 'cache/'
-if not os.path.exists(cache_dir):
-    os.makedirs(cache_dir)
-fastf1.Cache.enable_cache(cache_dir)
+import pandas as pd
+
+from tools import lap_analytics, schedule_cache, season_store, session_loader
 
 @tool
 def get_track_info(circuit_name: str, year: int) -> Dict[str, Any]:
@@ -20,15 +17,12 @@ def get_track_info(circuit_name: str, year: int) -> Dict[str, Any]:
         Dictionary with track details or error message
     """
     try:
-        schedule = fastf1.get_event_schedule(year)
-        event = schedule[schedule['EventName'].str.contains(circuit_name, case=False, na=False)]
+        event_data = schedule_cache.find_event(year, circuit_name)
         
-        if event.empty:
+        if event_data is None:
             return {"error": f"No event found for {circuit_name} in {year}"}
         
-        event_data = event.iloc[0]
-        session = fastf1.get_session(year, event_data['EventName'], 'R')
-        session.load(telemetry=False, weather=False, messages=False)
+        session = session_loader.load_session(year, int(event_data['RoundNumber']), 'R', profile="results")
         
         return {
             "circuit_name": event_data['EventName'],
@@ -54,8 +48,7 @@ def get_recent_race_results(event_name: str, year: int) -> Dict[str, Any]:
         Dictionary with race results or error message
     """
     try:
-        session = fastf1.get_session(year, event_name, 'R')
-        session.load()
+        session = session_loader.load_session(year, event_name, 'R', profile="results")
         
         results = session.results
         top_10 = results.head(10)[['Position', 'DriverNumber', 'Abbreviation', 'TeamName', 'Points', 'Status']]
@@ -81,35 +74,108 @@ def get_driver_form(driver_code: str, year: int, num_races: int = 5) -> Dict[str
         Dictionary with driver's recent results or error message
     """
     try:
-        schedule = fastf1.get_event_schedule(year)
-        completed_events = schedule[schedule['EventDate'] < fastf1.get_event_schedule(year).iloc[-1]['EventDate']].tail(num_races)
-        
-        driver_results = []
-        total_points = 0
+        form = season_store.get_recent_form(year, num_races, drivers=[driver_code])
         
-        for _, event in completed_events.iterrows():
-            try:
-                session = fastf1.get_session(year, event['EventName'], 'R')
-                session.load()
-                driver_result = session.results[session.results['Abbreviation'] == driver_code]
-                
-                if not driver_result.empty:
-                    result_data = driver_result.iloc[0]
-                    driver_results.append({
-                        "event": event['EventName'],
-                        "position": int(result_data['Position']) if result_data['Position'] > 0 else 'DNF',
-                        "points": float(result_data['Points']),
-                        "status": result_data['Status']
-                    })
-                    total_points += float(result_data['Points'])
-            except:
-                continue
+        driver_results = [
+            {
+                "event": row['EventName'],
+                "position": int(row['Position']) if row['Position'] > 0 else 'DNF',
+                "points": float(row['Points']),
+                "status": row['Status']
+            }
+            for _, row in form.iterrows()
+        ]
+        finishes = form['Position'].dropna()
         
         return {
             "driver": driver_code,
             "recent_results": driver_results,
-            "total_points_last_races": total_points,
-            "average_finish": sum(r['position'] for r in driver_results if isinstance(r['position'], int)) / len([r for r in driver_results if isinstance(r['position'], int)]) if driver_results else None
+            "total_points_last_races": float(form['Points'].sum()),
+            "average_finish": float(finishes.mean()) if not finishes.empty else None
         }
     except Exception as e:
         return {"error": f"Failed to get driver form: {str(e)}"}
+
+@tool
+def get_grid_form(year: int, num_races: int = 5, top_n: int = 10) -> Dict[str, Any]:
+    """Get recent form for the championship contenders: last N race results of each driver.
+    
+    Args:
+        year: Current season year
+        num_races: Number of recent races to analyze (default: 5)
+        top_n: Number of drivers to include, by championship position (default: 10)
+    
+    Returns:
+        Dictionary with a per-driver form table or error message
+    """
+    try:
+        table = season_store.get_grid_form(year, num_races, top_n)
+        
+        if table.empty:
+            return {"error": f"No completed races found for {year} season yet"}
+        
+        races = season_store.completed_events(year).tail(num_races)
+        
+        def number(value, digits: int = 1):
+            return round(float(value), digits) if pd.notna(value) else None
+        
+        return {
+            "year": year,
+            "races": races['EventName'].tolist(),
+            "results_order": "oldest to newest",
+            "drivers": [
+                {
+                    "position": int(row.ChampionshipPosition),
+                    "driver_code": row.Abbreviation,
+                    "team": row.TeamName,
+                    "season_points": number(row.Points),
+                    "results": row.Results if isinstance(row.Results, str) else "",
+                    "points": number(row.FormPoints),
+                    "average_finish": number(row.AverageFinish),
+                    "dnfs": int(row.DNFs) if pd.notna(row.DNFs) else 0,
+                    "positions_gained": int(row.PositionsGained) if pd.notna(row.PositionsGained) else None
+                }
+                for row in table.itertuples(index=False)
+            ]
+        }
+    except Exception as e:
+        return {"error": f"Failed to get grid form: {str(e)}"}
+
+@tool
+def get_race_pace(event_name: str, year: int) -> Dict[str, Any]:
+    """Get long-run race pace and tyre degradation from a race's lap data.
+    
+    Args:
+        event_name: Name of the Grand Prix event
+        year: Year of the race to analyze
+    
+    Returns:
+        Dictionary with each driver's long-run pace, gap and degradation per lap,
+        degradation per compound, or error message
+    """
+    try:
+        pace = lap_analytics.session_pace(year, event_name, 'R')
+        if pace is None:
+            return {"error": f"No event found for {event_name} in {year}"}
+        return pace
+    except Exception as e:
+        return {"error": f"Failed to get race pace: {str(e)}"}
+
+@tool
+def get_qualifying_pace(event_name: str, year: int) -> Dict[str, Any]:
+    """Get qualifying gaps to pole and sector deltas from a qualifying session's lap data.
+    
+    Args:
+        event_name: Name of the Grand Prix event
+        year: Year of the qualifying session to analyze
+    
+    Returns:
+        Dictionary with each driver's best lap, gap to pole and sector deltas, or error message
+    """
+    try:
+        pace = lap_analytics.session_pace(year, event_name, 'Q')
+        if pace is None:
+            return {"error": f"No event found for {event_name} in {year}"}
+        return pace
+    except Exception as e:
+        return {"error": f"Failed to get qualifying pace: {str(e)}"}
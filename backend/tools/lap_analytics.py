@@ -0,0 +1,217 @@
+"""Vectorized pace analysis over a session's laps.
+
+Every computation works on whole columns of the ``Laps`` frame: filters
+are boolean masks, per-driver and per-stint figures come from grouped
+reductions, and stint degradation is a least-squares slope assembled from
+grouped sums. Nothing loops over drivers in Python. Aggregates are small
+dicts cached per session in the derived store, so repeat briefings do not
+touch the laps again.
+"""
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from tools import derived_store, schedule_cache, session_loader
+
+LAP_COLUMNS = [
+    'Driver', 'Team', 'LapNumber', 'LapTime', 'Stint', 'Compound', 'TyreLife',
+    'Sector1Time', 'Sector2Time', 'Sector3Time', 'PitInTime', 'PitOutTime',
+    'TrackStatus', 'IsAccurate', 'Deleted'
+]
+SECTORS = ['Sector1Time', 'Sector2Time', 'Sector3Time']
+
+# Stints shorter than this many clean laps are not treated as long runs
+LONG_RUN_MIN_LAPS = int(os.getenv("LONG_RUN_MIN_LAPS", "8"))
+# Laps slower than this multiple of a driver's median clean lap are discarded
+OUTLIER_FACTOR = 1.07
+
+def _seconds(column: pd.Series) -> np.ndarray:
+    return column.dt.total_seconds().to_numpy(dtype='float64')
+
+def compact_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """Only the columns the analysis needs, timings as float32 seconds."""
+    frame = laps.reindex(columns=LAP_COLUMNS)
+    compact = pd.DataFrame({
+        'Driver': frame['Driver'].astype('category'),
+        'Team': frame['Team'].astype('category'),
+        'LapNumber': frame['LapNumber'].astype('float32'),
+        'LapTime': _seconds(frame['LapTime']).astype('float32'),
+        'Stint': frame['Stint'].astype('float32'),
+        'Compound': frame['Compound'].astype('category'),
+        'TyreLife': frame['TyreLife'].astype('float32'),
+        'InOutLap': (frame['PitInTime'].notna() | frame['PitOutTime'].notna()).to_numpy(),
+        'Green': (frame['TrackStatus'].astype(str) == '1').to_numpy(),
+        'Accurate': frame['IsAccurate'].fillna(True).astype(bool).to_numpy(),
+        'Deleted': frame['Deleted'].fillna(False).astype(bool).to_numpy(),
+    })
+    for sector in SECTORS:
+        compact[sector] = _seconds(frame[sector]).astype('float32')
+    return compact
+
+def clean_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """Green-flag, accurately timed racing laps without pit laps, lap 1 or outliers."""
+    mask = (
+        laps['LapTime'].notna().to_numpy()
+        & ~laps['InOutLap'].to_numpy()
+        & laps['Green'].to_numpy()
+        & laps['Accurate'].to_numpy()
+        & (laps['LapNumber'].to_numpy() > 1)
+    )
+    clean = laps[mask]
+    median = clean.groupby('Driver', observed=True)['LapTime'].transform('median').to_numpy()
+    return clean[clean['LapTime'].to_numpy() <= median * OUTLIER_FACTOR]
+
+def stint_slopes(laps: pd.DataFrame) -> pd.DataFrame:
+    """Least-squares lap time vs. tyre age slope (s/lap) for every driver stint.
+    
+    The slope of each group is built from grouped sums, so one pass over the
+    frame fits every stint at once.
+    """
+    x = laps['TyreLife'].to_numpy(dtype='float64')
+    y = laps['LapTime'].to_numpy(dtype='float64')
+    terms = pd.DataFrame({
+        'Driver': laps['Driver'], 'Stint': laps['Stint'], 'Compound': laps['Compound'],
+        'n': 1.0, 'x': x, 'y': y, 'xy': x * y, 'xx': x * x
+    })
+    sums = terms.groupby(['Driver', 'Stint'], observed=True).agg(
+        n=('n', 'sum'), x=('x', 'sum'), y=('y', 'sum'), xy=('xy', 'sum'), xx=('xx', 'sum'),
+        Compound=('Compound', 'first')
+    )
+    denominator = sums['n'] * sums['xx'] - sums['x'] ** 2
+    numerator = sums['n'] * sums['xy'] - sums['x'] * sums['y']
+    # A stint run on a single tyre age has no slope
+    sums['Slope'] = (numerator / denominator).where(denominator > 0)
+    sums['Pace'] = sums['y'] / sums['n']
+    return sums.rename(columns={'n': 'Laps'})[['Compound', 'Laps', 'Pace', 'Slope']].reset_index()
+
+def sector_deltas(laps: pd.DataFrame) -> pd.DataFrame:
+    """Each driver's best sectors, their gap to the session-best sectors and ideal lap."""
+    best = laps.groupby('Driver', observed=True)[SECTORS].min()
+    deltas = best - best.min()
+    deltas.columns = ['S1Delta', 'S2Delta', 'S3Delta']
+    result = pd.concat([best, deltas], axis=1)
+    result['IdealLap'] = best.sum(axis=1, min_count=3)
+    return result.reset_index()
+
+def _driver_teams(laps: pd.DataFrame) -> pd.Series:
+    return laps.groupby('Driver', observed=True)['Team'].first()
+
+def _ms(seconds: float) -> Optional[int]:
+    """Whole milliseconds; gaps and slopes are far below the 0.1s that compaction keeps."""
+    return int(round(float(seconds) * 1000)) if pd.notna(seconds) else None
+
+def race_pace(laps: pd.DataFrame, top: int = 10) -> Dict[str, Any]:
+    """Long-run pace, degradation per driver and compound from a race's laps."""
+    clean = clean_laps(laps)
+    if clean.empty:
+        return {"error": "No clean race laps available"}
+    
+    stints = stint_slopes(clean)
+    long_runs = stints[stints['Laps'] >= LONG_RUN_MIN_LAPS]
+    if long_runs.empty:
+        long_runs = stints
+    
+    # Lap-weighted averages per driver over their long stints
+    fitted = long_runs['Laps'].where(long_runs['Slope'].notna(), 0)
+    weighted = long_runs.assign(PaceLaps=long_runs['Pace'] * long_runs['Laps'],
+                                SlopeLaps=long_runs['Slope'].fillna(0) * fitted,
+                                FittedLaps=fitted)
+    drivers = weighted.groupby('Driver', observed=True)[['Laps', 'PaceLaps', 'SlopeLaps', 'FittedLaps']].sum()
+    drivers['LongRunPace'] = drivers['PaceLaps'] / drivers['Laps']
+    drivers['Degradation'] = (drivers['SlopeLaps'] / drivers['FittedLaps']).where(drivers['FittedLaps'] > 0)
+    drivers['Gap'] = drivers['LongRunPace'] - drivers['LongRunPace'].min()
+    drivers['Team'] = _driver_teams(laps)
+    drivers = drivers.sort_values('LongRunPace').head(top).reset_index()
+    
+    compounds = long_runs.groupby('Compound', observed=True).agg(
+        stints=('Slope', 'size'), deg_s_per_lap=('Slope', 'median'), pace_s=('Pace', 'median')
+    ).reset_index()
+    
+    return {
+        "long_run_pace": [
+            {
+                "driver": row.Driver,
+                "team": row.Team,
+                "pace_s": round(float(row.LongRunPace), 3),
+                "gap_ms": _ms(row.Gap),
+                "deg_ms_per_lap": _ms(row.Degradation),
+                "laps": int(row.Laps)
+            }
+            for row in drivers.itertuples(index=False)
+        ],
+        "compound_degradation": [
+            {
+                "compound": row.Compound,
+                "stints": int(row.stints),
+                "deg_ms_per_lap": _ms(row.deg_s_per_lap),
+                "pace_s": round(float(row.pace_s), 3)
+            }
+            for row in compounds.itertuples(index=False)
+        ],
+        "long_run_min_laps": LONG_RUN_MIN_LAPS
+    }
+
+def qualifying_pace(laps: pd.DataFrame, top: int = 10) -> Dict[str, Any]:
+    """Best-lap gaps to pole and sector deltas from a qualifying session's laps."""
+    # Deleted laps (e.g. track limits) never counted towards the grid
+    timed = laps[laps['LapTime'].notna().to_numpy() & ~laps['Deleted'].to_numpy()]
+    if timed.empty:
+        return {"error": "No timed qualifying laps available"}
+    
+    best = timed.groupby('Driver', observed=True)['LapTime'].min().sort_values()
+    pole = best.iloc[0]
+    sectors = sector_deltas(timed).set_index('Driver')
+    table = pd.DataFrame({
+        'Best': best,
+        'Gap': best - pole,
+        'GapPct': (best / pole - 1) * 100,
+        'Team': _driver_teams(laps).reindex(best.index)
+    }).join(sectors[['S1Delta', 'S2Delta', 'S3Delta', 'IdealLap']]).head(top).reset_index()
+    
+    return {
+        "qualifying_gaps": [
+            {
+                "driver": row.Driver,
+                "team": row.Team,
+                "best_lap_s": round(float(row.Best), 3),
+                "gap_ms": _ms(row.Gap),
+                "gap_pct": round(float(row.GapPct), 2),
+                "s1_delta_ms": _ms(row.S1Delta),
+                "s2_delta_ms": _ms(row.S2Delta),
+                "s3_delta_ms": _ms(row.S3Delta),
+                "ideal_gain_ms": _ms(row.Best - row.IdealLap)
+            }
+            for row in table.itertuples(index=False)
+        ]
+    }
+
+ANALYSES = {
+    "R": ("pace:R", race_pace),
+    "Q": ("pace:Q", qualifying_pace),
+}
+
+def session_pace(year: int, event_name: str, session_name: str) -> Optional[Dict[str, Any]]:
+    """Pace aggregates for a session, computed once and cached per session.
+    
+    Args:
+        year: Season year
+        event_name: Grand Prix name, resolved through the schedule cache
+        session_name: 'R' for race pace or 'Q' for qualifying gaps
+    
+    Returns None if the event is not on the calendar.
+    """
+    event = schedule_cache.find_event(year, event_name)
+    if event is None or int(event['RoundNumber']) <= 0:
+        return None
+    
+    kind, analyse = ANALYSES[session_name]
+    round_number = int(event['RoundNumber'])
+    
+    def compute() -> Dict[str, Any]:
+        session = session_loader.load_session(year, round_number, session_name, profile="laps")
+        return {"event": event['EventName'], "year": year, **analyse(compact_laps(session.laps))}
+    
+    return derived_store.get_or_compute(year, round_number, kind, compute,
+                                        keep=lambda result: "error" not in result)
@@ -0,0 +1,174 @@
+"""In-process latency, cache and token metrics in Prometheus text format.
+
+Histograms, counters and gauges are created once at import and updated from both
+the event loop and executor threads. ``render()`` produces the exposition
+text served by /api/metrics. No dependencies beyond the standard library, so
+any module can record metrics without slowing startup.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Seconds; covers cache hits (ms) through cold FastF1 loads and LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            return self._values.get(key, 0)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {value:g}" for key, value in items]
+
+class Gauge:
+    """Value that can go up and down, set by its owner."""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+    
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {value:g}" for key, value in items]
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            # Per-bucket counts, then +Inf count and sum
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+    
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block, including when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.labels, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+_registry: List = []
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+NODE_SECONDS = _register(Histogram(
+    "f1_graph_node_seconds", "Wall time of each LangGraph node", ["node"]))
+LLM_SECONDS = _register(Histogram(
+    "f1_llm_call_seconds", "Wall time of LLM calls", ["node"]))
+TOOL_SECONDS = _register(Histogram(
+    "f1_tool_seconds", "Wall time of each tool invocation", ["tool", "status"]))
+SESSION_LOAD_SECONDS = _register(Histogram(
+    "f1_fastf1_session_load_seconds", "Wall time of FastF1 session.load", ["session", "profile"]))
+REQUEST_SECONDS = _register(Histogram(
+    "f1_request_seconds", "Wall time of briefing API requests", ["endpoint"]))
+CACHE_REQUESTS = _register(Counter(
+    "f1_cache_requests_total", "Cache lookups by cache and result", ["cache", "result"]))
+LLM_TOKENS = _register(Counter(
+    "f1_llm_tokens_total", "LLM tokens used", ["node", "direction"]))
+SPECULATIVE_CALLS = _register(Counter(
+    "f1_speculative_tool_calls_total", "Tool calls started before the plan, by outcome", ["result"]))
+SESSION_CACHE_BYTES = _register(Gauge(
+    "f1_session_cache_bytes", "Estimated memory held by cached FastF1 sessions"))
+SESSION_CACHE_ENTRIES = _register(Gauge(
+    "f1_session_cache_entries", "FastF1 sessions held in memory"))
+SESSION_CACHE_EVICTIONS = _register(Counter(
+    "f1_session_cache_evictions_total", "FastF1 sessions evicted from memory", ["reason"]))
+
+def cache_hit(cache: str) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit")
+
+def cache_miss(cache: str) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="miss")
+
+def record_tokens(node: str, usage) -> None:
+    """Add a LangChain ``usage_metadata`` dict (input/output tokens) to the token counter."""
+    if not usage:
+        return
+    for direction in ("input", "output"):
+        count = usage.get(f"{direction}_tokens") or 0
+        if count:
+            LLM_TOKENS.inc(count, node=node, direction=direction)
+
+def render() -> str:
+    """Every registered metric in Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,13 @@
+"""Event name normalization shared by lookups and cache keys.
+
+Kept free of FastF1 and pandas imports so lightweight modules can use it.
+"""
+import re
+import unicodedata
+
+def normalize_name(name: str) -> str:
+    """Lower-case, strip accents and drop 'Grand Prix'/'GP' from an event name."""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r'\b(formula 1|f1|grand prix|gp)\b', ' ', text)
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
@@ -0,0 +1,167 @@
+"""Long-lived news search backend with a stale-while-revalidate cache.
+
+Every user asking about the same race sends the same search, so results are
+cached per normalized query. Within NEWS_TTL_SECONDS a cached result is served
+as is; for NEWS_STALE_SECONDS after that it is still served while a background
+refresh runs. Concurrent misses for the same query share one backend call.
+Set NEWS_BACKEND=fake (or call set_backend) to search offline.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools import metrics
+from tools.naming import normalize_name
+
+NEWS_TTL = float(os.getenv("NEWS_TTL_SECONDS", "600"))
+NEWS_STALE = float(os.getenv("NEWS_STALE_SECONDS", "3600"))
+
+class TavilyBackend:
+    """Tavily search through a single reused client."""
+    
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                api_key = os.getenv('TAVILY_API_KEY')
+                if not api_key:
+                    raise RuntimeError("TAVILY_API_KEY not configured")
+                from tavily import TavilyClient
+                self._client = TavilyClient(api_key=api_key)
+            return self._client
+    
+    def search(self, query: str, max_results: int) -> Dict[str, Any]:
+        return self._get_client().search(
+            query=query,
+            search_depth="basic",
+            max_results=max_results
+        )
+
+class FakeSearchBackend:
+    """Offline backend returning canned Tavily-shaped results, for load tests."""
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+    
+    def search(self, query: str, max_results: int) -> Dict[str, Any]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {
+            "results": [
+                {
+                    "title": f"{query} - story {i + 1}",
+                    "url": f"https://example.com/news/{i + 1}",
+                    "content": f"Placeholder coverage for {query}.",
+                    "published_date": "",
+                    "score": round(1 - i * 0.1, 2)
+                }
+                for i in range(max_results)
+            ]
+        }
+
+_backend = FakeSearchBackend() if os.getenv("NEWS_BACKEND") == "fake" else TavilyBackend()
+_entries: Dict[Tuple[str, int], Tuple[Dict[str, Any], float]] = {}
+_refreshing = set()
+_inflight: Dict[Tuple[str, int], Future] = {}
+_lock = threading.Lock()
+
+def set_backend(backend) -> None:
+    """Swap the search backend (anything with ``search(query, max_results)``) and clear the cache."""
+    global _backend
+    with _lock:
+        _backend = backend
+        _entries.clear()
+
+def _fetch(key: Tuple[str, int], search_query: str, max_results: int) -> Dict[str, Any]:
+    response = _backend.search(search_query, max_results)
+    with _lock:
+        _entries[key] = (response, time.monotonic())
+    return response
+
+def _fetch_once(key: Tuple[str, int], search_query: str, max_results: int) -> Dict[str, Any]:
+    """Fetch a missing entry; callers missing the same key meanwhile wait for this call."""
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+    
+    try:
+        response = _fetch(key, search_query, max_results)
+        future.set_result(response)
+        return response
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+def _refresh(key: Tuple[str, int], search_query: str, max_results: int) -> None:
+    try:
+        _fetch(key, search_query, max_results)
+    except Exception as e:
+        print(f"News cache: background refresh failed for {search_query!r}: {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+def search(query: str, max_results: int = 5) -> Dict[str, Any]:
+    """Search F1 news for a race query, serving cached or stale results when possible."""
+    search_query = f"F1 Formula 1 {query} latest news"
+    key = (normalize_name(query), max_results)
+    
+    with _lock:
+        entry = _entries.get(key)
+        age = time.monotonic() - entry[1] if entry else None
+        if entry and age < NEWS_TTL:
+            metrics.cache_hit("news")
+            return entry[0]
+        if entry and age < NEWS_TTL + NEWS_STALE:
+            metrics.CACHE_REQUESTS.inc(cache="news", result="stale")
+            if key not in _refreshing:
+                _refreshing.add(key)
+                threading.Thread(target=_refresh, args=(key, search_query, max_results), daemon=True).start()
+            return entry[0]
+    
+    metrics.cache_miss("news")
+    return _fetch_once(key, search_query, max_results)
+
+def upcoming_race_queries(count: int = 3) -> List[str]:
+    """Queries the briefing planner would issue for the next few races."""
+    # Imported here so searching news does not load FastF1 and pandas
+    import pandas as pd
+    from tools import schedule_cache
+    
+    year = datetime.now().year
+    schedule = schedule_cache.get_schedule(year)
+    upcoming = schedule[(schedule['RoundNumber'] > 0) & (schedule['EventDate'] >= pd.Timestamp.now().normalize())]
+    return [f"{event['EventName']} {year}" for _, event in upcoming.head(count).iterrows()]
+
+def prefetch_upcoming(count: int = 3, max_results: int = 5) -> None:
+    """Warm the cache for the next ``count`` races on the calendar."""
+    try:
+        queries = upcoming_race_queries(count)
+    except Exception as e:
+        print(f"News cache: could not read schedule for prefetch: {e}")
+        return
+    
+    for query in queries:
+        try:
+            search(query, max_results)
+        except Exception as e:
+            print(f"News cache: prefetch failed for {query!r}: {e}")
+
+def stats() -> Dict[str, Optional[int]]:
+    with _lock:
+        return {"entries": len(_entries), "refreshing": len(_refreshing)}
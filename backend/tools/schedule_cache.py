@@ -0,0 +1,181 @@
+"""In-memory cache of FastF1 event schedules with a name/alias index.
+
+Every caller asking for the same season gets the same DataFrame object back,
+so it must be treated as read-only. Past seasons never expire; the current
+and future seasons are refreshed after ``SCHEDULE_TTL`` seconds so calendar
+changes are picked up.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import fastf1
+import pandas as pd
+
+from tools import fastf1_cache, metrics
+from tools.naming import normalize_name
+
+fastf1_cache.enable()
+
+SCHEDULE_TTL = float(os.getenv("SCHEDULE_TTL_SECONDS", "21600"))
+# A race is taken to be over this long after its scheduled start
+RACE_DURATION = pd.Timedelta(hours=3)
+
+# Common names mapped to official Grand Prix names (mirrors PLANNER_PROMPT)
+EVENT_ALIASES = {
+    "silverstone": "British Grand Prix",
+    "british": "British Grand Prix",
+    "monza": "Italian Grand Prix",
+    "italian": "Italian Grand Prix",
+    "spa": "Belgian Grand Prix",
+    "belgian": "Belgian Grand Prix",
+    "suzuka": "Japanese Grand Prix",
+    "japanese": "Japanese Grand Prix",
+    "austin": "United States Grand Prix",
+    "cota": "United States Grand Prix",
+    "us": "United States Grand Prix",
+    "usa": "United States Grand Prix",
+    "vegas": "Las Vegas Grand Prix",
+    "jeddah": "Saudi Arabian Grand Prix",
+    "saudi": "Saudi Arabian Grand Prix",
+    "saudi arabia": "Saudi Arabian Grand Prix",
+    "melbourne": "Australian Grand Prix",
+    "australia": "Australian Grand Prix",
+    "imola": "Emilia Romagna Grand Prix",
+    "spain": "Spanish Grand Prix",
+    "barcelona": "Spanish Grand Prix",
+    "catalunya": "Spanish Grand Prix",
+    "canada": "Canadian Grand Prix",
+    "montreal": "Canadian Grand Prix",
+    "austria": "Austrian Grand Prix",
+    "spielberg": "Austrian Grand Prix",
+    "hungary": "Hungarian Grand Prix",
+    "budapest": "Hungarian Grand Prix",
+    "netherlands": "Dutch Grand Prix",
+    "zandvoort": "Dutch Grand Prix",
+    "mexico": "Mexico City Grand Prix",
+    "brazil": "São Paulo Grand Prix",
+    "brazilian": "São Paulo Grand Prix",
+    "interlagos": "São Paulo Grand Prix",
+    "sao paulo": "São Paulo Grand Prix",
+    "baku": "Azerbaijan Grand Prix",
+    "lusail": "Qatar Grand Prix",
+    "yas marina": "Abu Dhabi Grand Prix",
+    "shanghai": "Chinese Grand Prix",
+}
+
+_entries: Dict[int, Tuple[pd.DataFrame, Dict[str, int], float]] = {}
+_year_locks: Dict[int, threading.Lock] = {}
+_lock = threading.Lock()
+
+def _build_index(schedule: pd.DataFrame) -> Dict[str, int]:
+    """Map normalized names to row positions, most specific names first."""
+    index: Dict[str, int] = {}
+    rows = list(enumerate(schedule.itertuples(index=False)))
+    
+    for column in ('EventName', 'OfficialEventName', 'Location', 'Country'):
+        if column not in schedule.columns:
+            continue
+        for pos, row in rows:
+            key = normalize_name(getattr(row, column))
+            if key:
+                index.setdefault(key, pos)
+        
+        if column == 'EventName':
+            for alias, official in EVENT_ALIASES.items():
+                pos = index.get(normalize_name(official))
+                if pos is not None:
+                    index.setdefault(alias, pos)
+    
+    return index
+
+def _is_expired(year: int, fetched_at: float) -> bool:
+    if year < datetime.now().year:
+        return False
+    return time.monotonic() - fetched_at > SCHEDULE_TTL
+
+def _year_lock(year: int) -> threading.Lock:
+    with _lock:
+        if year not in _year_locks:
+            _year_locks[year] = threading.Lock()
+        return _year_locks[year]
+
+def _get_entry(year: int) -> Tuple[pd.DataFrame, Dict[str, int], float]:
+    entry = _entries.get(year)
+    if entry and not _is_expired(year, entry[2]):
+        metrics.cache_hit("schedule")
+        return entry
+    
+    with _year_lock(year):
+        entry = _entries.get(year)
+        if entry and not _is_expired(year, entry[2]):
+            metrics.cache_hit("schedule")
+            return entry
+        
+        metrics.cache_miss("schedule")
+        schedule = fastf1.get_event_schedule(year)
+        entry = (schedule, _build_index(schedule), time.monotonic())
+        _entries[year] = entry
+        return entry
+
+def get_schedule(year: int) -> pd.DataFrame:
+    """Cached equivalent of ``fastf1.get_event_schedule(year)``. Do not mutate."""
+    return _get_entry(year)[0]
+
+def lookup_event(year: int, name: str) -> Optional[Tuple[pd.Series, bool]]:
+    """Look up a season's event by official name, alias, location or country.
+    
+    Returns the schedule row and whether the name matched an index entry
+    exactly. Otherwise falls back to a substring match against the indexed
+    names, which covers what the old ``str.contains`` scans matched.
+    """
+    schedule, index, _ = _get_entry(year)
+    key = normalize_name(name)
+    if not key:
+        return None
+    
+    pos = index.get(key)
+    if pos is not None:
+        return schedule.iloc[pos], True
+    
+    matches = [p for k, p in index.items() if key in k]
+    if not matches:
+        return None
+    return schedule.iloc[min(matches)], False
+
+def find_event(year: int, name: str) -> Optional[pd.Series]:
+    """Schedule row for an event name, alias, location or country, if any."""
+    match = lookup_event(year, name)
+    return match[0] if match else None
+
+def race_over(events: pd.DataFrame) -> pd.Series:
+    """Mask of schedule rows whose race has finished.
+    
+    Uses the race's scheduled start in UTC plus RACE_DURATION where the
+    schedule has session times, otherwise waits until the race date has passed.
+    """
+    over = events['EventDate'] < pd.Timestamp.now().normalize()
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+    for n in range(1, 6):
+        name, start = f'Session{n}', f'Session{n}DateUtc'
+        if name not in events.columns or start not in events.columns:
+            continue
+        starts = pd.to_datetime(events[start], utc=True).dt.tz_localize(None)
+        is_race = (events[name] == 'Race') & starts.notna()
+        over = over.where(~is_race, starts + RACE_DURATION <= now)
+    return over
+
+def warm(years: Iterable[int]) -> None:
+    """Populate the cache for the given seasons, logging failures."""
+    for year in years:
+        try:
+            _get_entry(year)
+        except Exception as e:
+            print(f"Schedule cache: could not warm {year}: {e}")
+
+def clear() -> None:
+    """Drop every cached schedule."""
+    with _lock:
+        _entries.clear()
@@ -1,7 +1,7 @@
-import os
 from langchain_core.tools import tool
 from typing import Dict, Any
-from tavily import TavilyClient
+
+from tools import news_client
 
 @tool
 def search_f1_news(query: str, max_results: int = 5) -> Dict[str, Any]:
@@ -15,18 +15,7 @@ def search_f1_news(query: str, max_results: int = 5) -> Dict[str, Any]:
         Dictionary with news articles or error message
     """
     try:
-        api_key = os.getenv('TAVILY_API_KEY')
-        if not api_key:
-            return {"error": "TAVILY_API_KEY not configured"}
-        
-        client = TavilyClient(api_key=api_key)
-        
-        search_query = f"F1 Formula 1 {query} latest news"
-        response = client.search(
-            query=search_query,
-            search_depth="basic",
-            max_results=max_results
-        )
+        response = news_client.search(query, max_results)
         
         articles = []
         for result in response.get('results', []):
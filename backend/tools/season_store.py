@@ -0,0 +1,203 @@
+"""Process-wide store of race results, kept as one compact frame per season.
+
+Each race (and sprint) session is loaded at most once per process, and its
+results table is shared with other worker processes through the derived
+store. Tools query the per-season frames instead of loading sessions
+themselves.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tools import derived_store, schedule_cache, session_loader
+
+RESULT_COLUMNS = [
+    'DriverNumber', 'Abbreviation', 'FullName', 'TeamName',
+    'Position', 'GridPosition', 'Points', 'Status', 'Time'
+]
+
+_frames: Dict[int, pd.DataFrame] = {}
+_loaded: Dict[int, Set[Tuple[int, str]]] = {}
+_year_locks: Dict[int, threading.Lock] = {}
+_lock = threading.Lock()
+
+def _year_lock(year: int) -> threading.Lock:
+    with _lock:
+        if year not in _year_locks:
+            _year_locks[year] = threading.Lock()
+        return _year_locks[year]
+
+def completed_events(year: int) -> pd.DataFrame:
+    """Championship rounds of a season whose race has finished."""
+    schedule = schedule_cache.get_schedule(year)
+    rounds = schedule[schedule['RoundNumber'] > 0]
+    return rounds[schedule_cache.race_over(rounds)]
+
+def _sessions_for(event: pd.Series) -> List[str]:
+    if str(event.get('EventFormat', '')).startswith('sprint'):
+        return ['S', 'R']
+    return ['R']
+
+def _load_session_results(year: int, event: pd.Series, session_name: str) -> pd.DataFrame:
+    return derived_store.get_or_compute(
+        year, int(event['RoundNumber']), f"results:{session_name}",
+        lambda: _session_results(year, event, session_name),
+        keep=lambda results: not results.empty
+    )
+
+def _session_results(year: int, event: pd.Series, session_name: str) -> pd.DataFrame:
+    session = session_loader.load_session(year, int(event['RoundNumber']), session_name, profile="results")
+    
+    results = session.results.reindex(columns=RESULT_COLUMNS).copy()
+    results['Position'] = pd.to_numeric(results['Position'], errors='coerce').astype('float32')
+    results['GridPosition'] = pd.to_numeric(results['GridPosition'], errors='coerce').astype('float32')
+    results['Points'] = pd.to_numeric(results['Points'], errors='coerce').fillna(0).astype('float32')
+    results.insert(0, 'Session', session_name)
+    results.insert(0, 'EventName', event['EventName'])
+    results.insert(0, 'Round', int(event['RoundNumber']))
+    return results
+
+def load_rounds(year: int, events: pd.DataFrame) -> pd.DataFrame:
+    """Ensure the given schedule rows are in the store and return the season frame.
+    
+    Sessions that fail to load are skipped so one missing round does not
+    break season-wide queries.
+    """
+    with _year_lock(year):
+        loaded = _loaded.setdefault(year, set())
+        new_frames = []
+        
+        for _, event in events.iterrows():
+            for session_name in _sessions_for(event):
+                key = (int(event['RoundNumber']), session_name)
+                if key in loaded:
+                    continue
+                try:
+                    results = _load_session_results(year, event, session_name)
+                except Exception as e:
+                    print(f"Season store: skipped {year} round {key[0]} {session_name}: {e}")
+                    continue
+                # Results published late arrive empty; leave the round to be retried next query
+                if not results.empty:
+                    new_frames.append(results)
+                    loaded.add(key)
+        
+        if new_frames:
+            frames = [_frames[year]] if year in _frames else []
+            _frames[year] = (
+                pd.concat(frames + new_frames, ignore_index=True)
+                .sort_values(['Round', 'Session', 'Position'], ascending=[True, False, True])
+                .reset_index(drop=True)
+            )
+        
+        return _frames.get(year, pd.DataFrame(columns=['Round', 'EventName', 'Session'] + RESULT_COLUMNS))
+
+def get_season_results(year: int) -> pd.DataFrame:
+    """Results of every completed race and sprint session of a season."""
+    return load_rounds(year, completed_events(year))
+
+def get_race_results(year: int, event: pd.Series) -> pd.DataFrame:
+    """Grand Prix results for a single schedule row, loading only that round."""
+    frame = load_rounds(year, event.to_frame().T)
+    return frame[(frame['Round'] == int(event['RoundNumber'])) & (frame['Session'] == 'R')]
+
+def get_standings(year: int) -> pd.DataFrame:
+    """Cumulative drivers' championship table from all completed sessions."""
+    results = get_season_results(year)
+    if results.empty:
+        return pd.DataFrame(columns=['Abbreviation', 'FullName', 'TeamName', 'Points', 'Wins'])
+    
+    # Standings after a given round never change, so they are shared keyed by it,
+    # but only once no earlier round is missing from the store
+    last_round = int(results['Round'].max())
+    return derived_store.get_or_compute(
+        year, last_round, "standings",
+        lambda: _compute_standings(results),
+        keep=lambda _: results['Round'].nunique() == last_round
+    )
+
+def _compute_standings(results: pd.DataFrame) -> pd.DataFrame:
+    races = results[results['Session'] == 'R']
+    latest = results.drop_duplicates('Abbreviation', keep='last').set_index('Abbreviation')
+    
+    standings = pd.DataFrame({
+        'Points': results.groupby('Abbreviation', observed=True)['Points'].sum(),
+        'Wins': (races['Position'] == 1).groupby(races['Abbreviation'], observed=True).sum(),
+    })
+    standings['Wins'] = standings['Wins'].fillna(0).astype(int)
+    standings['FullName'] = latest['FullName']
+    standings['TeamName'] = latest['TeamName']
+    
+    return (
+        standings.sort_values(['Points', 'Wins'], ascending=False)
+        .reset_index()
+    )
+
+def get_recent_form(year: int, num_races: int, drivers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Grand Prix results of the last ``num_races`` completed rounds.
+    
+    Args:
+        year: Season year
+        num_races: Number of most recent rounds to include
+        drivers: Optional driver abbreviations to restrict the result to
+    """
+    events = completed_events(year).tail(num_races)
+    results = load_rounds(year, events)
+    form = results[(results['Session'] == 'R') & results['Round'].isin(events['RoundNumber'])]
+    if drivers is not None:
+        form = form[form['Abbreviation'].isin(list(drivers))]
+    return form
+
+def get_grid_form(year: int, num_races: int, top_n: Optional[int] = None) -> pd.DataFrame:
+    """Last-``num_races`` form of every driver, ordered by championship position.
+    
+    One pass over the same rounds ``get_recent_form`` loads for a single
+    driver, so the whole grid costs no extra session loads.
+    
+    Args:
+        year: Season year
+        num_races: Number of most recent rounds to include
+        top_n: Optionally keep only the leading drivers in the standings
+    """
+    standings = get_standings(year)
+    form = get_recent_form(year, num_races)
+    if standings.empty or form.empty:
+        return pd.DataFrame()
+    
+    status = form['Status'].astype(str)
+    finished = status.str.match(r'(Finished|Lapped|\+)').to_numpy() & form['Position'].notna().to_numpy()
+    finish = form['Position'].where(finished)
+    grid = form['GridPosition'].where(form['GridPosition'] > 0)
+    form = form.assign(
+        Abbreviation=form['Abbreviation'].astype(str),
+        Finish=finish,
+        DNF=~finished,
+        Gained=grid - finish,
+        Label=np.where(finished, finish.fillna(0).astype(int).astype(str), 'DNF')
+    )
+    
+    # Rows are in round order, so joined labels read oldest to newest
+    grouped = form.groupby('Abbreviation', sort=False)
+    table = pd.DataFrame({
+        'Results': grouped['Label'].agg(' '.join),
+        'FormPoints': grouped['Points'].sum(),
+        'AverageFinish': grouped['Finish'].mean(),
+        'BestFinish': grouped['Finish'].min(),
+        'DNFs': grouped['DNF'].sum(),
+        'PositionsGained': grouped['Gained'].sum(min_count=1)
+    })
+    
+    contenders = standings.assign(
+        ChampionshipPosition=np.arange(1, len(standings) + 1),
+        Abbreviation=standings['Abbreviation'].astype(str)
+    ).set_index('Abbreviation')
+    if top_n is not None:
+        contenders = contenders.head(top_n)
+    
+    return (
+        contenders[['ChampionshipPosition', 'TeamName', 'Points']]
+        .join(table, how='left')
+        .reset_index()
+    )
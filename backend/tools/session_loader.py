@@ -0,0 +1,239 @@
+"""Central FastF1 session loading with declarative data profiles.
+
+Tools ask for the least data they need instead of calling a bare
+``session.load()``, which pulls laps, telemetry, weather and race-control
+messages. Loaded sessions are kept in an LRU cache keyed by
+(year, event, session, profile); a session loaded with a richer profile also
+serves requests for a lighter one and replaces it in the cache.
+
+The cache is bounded by memory rather than only by entry count. Before a
+session is stored its results, laps and weather frames are downcast in place
+(low-cardinality strings to categoricals, float64 measures such as lap
+numbers, tyre life and speeds to float32; timedelta timings stay as they are
+because tools rely on them), and its size is estimated from the frames'
+``memory_usage(deep=True)``. Least recently used sessions are evicted once
+the total exceeds SESSION_CACHE_MB. Sessions whose results (or laps) have
+not been published yet are returned but not cached, so they are loaded
+again on the next request.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import fastf1
+import pandas as pd
+
+from tools import fastf1_cache, metrics, schedule_cache
+
+fastf1_cache.enable()
+
+# Load flags for each profile, ordered from lightest to richest
+PROFILES = {
+    "results": {"laps": False, "telemetry": False, "weather": False, "messages": False},
+    "laps": {"laps": True, "telemetry": False, "weather": False, "messages": False},
+    "telemetry": {"laps": True, "telemetry": True, "weather": True, "messages": True},
+}
+PROFILE_ORDER = list(PROFILES)
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "32"))
+SESSION_CACHE_BYTES = int(float(os.getenv("SESSION_CACHE_MB", "512")) * 1024 * 1024)
+
+# Session frames held by the cache; telemetry is counted but not downcast
+FRAME_ATTRIBUTES = ("results", "laps", "weather_data", "race_control_messages")
+TELEMETRY_ATTRIBUTES = ("car_data", "pos_data")
+# String columns with few distinct values, stored as categoricals
+CATEGORY_COLUMNS = {
+    "Driver", "DriverNumber", "Abbreviation", "DriverId", "FullName", "FirstName", "LastName",
+    "BroadcastName", "Team", "TeamName", "TeamId", "TeamColor", "CountryCode", "HeadshotUrl",
+    "Compound", "TrackStatus", "Status", "ClassifiedPosition"
+}
+
+SessionKey = Tuple[int, Union[int, str], str, str]
+
+_sessions: "OrderedDict[SessionKey, fastf1.core.Session]" = OrderedDict()
+_sizes: Dict[SessionKey, int] = {}
+_key_locks: Dict[SessionKey, threading.Lock] = {}
+_lock = threading.Lock()
+
+def _event_key(year: int, event: Union[int, str]) -> Union[int, str]:
+    """Resolve event names to round numbers so aliases share a cache entry."""
+    if isinstance(event, str):
+        try:
+            match = schedule_cache.find_event(year, event)
+        except Exception:
+            match = None
+        if match is not None and int(match['RoundNumber']) > 0:
+            return int(match['RoundNumber'])
+        return event
+    return int(event)
+
+def _loaded(session: Any, attribute: str) -> Optional[Any]:
+    """A session attribute if it was loaded; FastF1 raises on access to unloaded data."""
+    try:
+        return getattr(session, attribute)
+    except Exception:
+        return None
+
+def _frame_bytes(frame: Any) -> int:
+    if isinstance(frame, pd.DataFrame):
+        return int(frame.memory_usage(deep=True).sum())
+    return 0
+
+def compact_frame(frame: pd.DataFrame) -> None:
+    """Downcast a frame's columns in place: categoricals for names, float32 for measures."""
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if dtype == "float64":
+            frame[column] = frame[column].astype("float32")
+        elif dtype == object and column in CATEGORY_COLUMNS:
+            frame[column] = frame[column].astype("category")
+
+def compact_session(session: Any) -> None:
+    for attribute in FRAME_ATTRIBUTES:
+        frame = _loaded(session, attribute)
+        if isinstance(frame, pd.DataFrame) and not frame.empty:
+            compact_frame(frame)
+
+def session_bytes(session: Any) -> int:
+    """Estimated memory held by a session's loaded frames and telemetry."""
+    size = sum(_frame_bytes(_loaded(session, attribute)) for attribute in FRAME_ATTRIBUTES)
+    for attribute in TELEMETRY_ATTRIBUTES:
+        telemetry = _loaded(session, attribute)
+        if isinstance(telemetry, dict):
+            size += sum(_frame_bytes(frame) for frame in telemetry.values())
+    return size
+
+def is_published(session: Any, profile: str) -> bool:
+    """Whether the data a profile asks for is available, not yet-to-be-published empty frames."""
+    results = _loaded(session, "results")
+    if not isinstance(results, pd.DataFrame) or results.empty:
+        return False
+    # Before classification FastF1 fills results from the entry list, without positions
+    if 'Position' in results.columns and results['Position'].isna().all():
+        return False
+    if PROFILES[profile]["laps"]:
+        laps = _loaded(session, "laps")
+        return isinstance(laps, pd.DataFrame) and not laps.empty
+    return True
+
+def _cached(year: int, event: Union[int, str], session_name: str, profile: str):
+    with _lock:
+        for candidate in PROFILE_ORDER[PROFILE_ORDER.index(profile):]:
+            key = (year, event, session_name, candidate)
+            if key in _sessions:
+                _sessions.move_to_end(key)
+                return _sessions[key]
+    return None
+
+def _key_lock(key: SessionKey) -> threading.Lock:
+    with _lock:
+        if key not in _key_locks:
+            _key_locks[key] = threading.Lock()
+        return _key_locks[key]
+
+def load_session(year: int, event: Union[int, str], session_name: str = 'R',
+                 profile: str = "results") -> "fastf1.core.Session":
+    """Return a loaded FastF1 session containing at least the profile's data.
+    
+    Args:
+        year: Season year
+        event: Round number or event name
+        session_name: FastF1 session identifier (e.g. 'R', 'Q', 'S')
+        profile: One of PROFILES - 'results', 'laps' or 'telemetry'
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown session profile: {profile}")
+    
+    event = _event_key(year, event)
+    session = _cached(year, event, session_name, profile)
+    if session is not None:
+        metrics.cache_hit("session")
+        return session
+    
+    key = (year, event, session_name, profile)
+    with _key_lock(key):
+        session = _cached(year, event, session_name, profile)
+        if session is not None:
+            metrics.cache_hit("session")
+            return session
+        
+        metrics.cache_miss("session")
+        session = fastf1.get_session(year, event, session_name)
+        with metrics.SESSION_LOAD_SECONDS.time(session=session_name, profile=profile):
+            session.load(**PROFILES[profile])
+        compact_session(session)
+        if is_published(session, profile):
+            _store(key, session, session_bytes(session))
+        else:
+            print(f"Session cache: not caching {key}, its data is not published yet")
+        return session
+
+def _drop(key: SessionKey) -> None:
+    """Remove a cache entry; caller holds _lock."""
+    _sessions.pop(key, None)
+    _sizes.pop(key, None)
+    _key_locks.pop(key, None)
+
+def _store(key: SessionKey, session: Any, size: int) -> None:
+    """Cache a session, then evict least recently used ones until within budget.
+    
+    The newest session is always kept, even if it alone exceeds the budget.
+    """
+    year, event, session_name, profile = key
+    with _lock:
+        # Lighter profiles of the same session are served by this one from now on
+        for lighter in PROFILE_ORDER[:PROFILE_ORDER.index(profile)]:
+            _drop((year, event, session_name, lighter))
+        
+        _sessions[key] = session
+        _sizes[key] = size
+        while len(_sessions) > 1:
+            if sum(_sizes.values()) > SESSION_CACHE_BYTES:
+                reason = "bytes"
+            elif len(_sessions) > SESSION_CACHE_SIZE:
+                reason = "entries"
+            else:
+                break
+            evicted = next(iter(_sessions))
+            print(f"Session cache: evicted {evicted} ({_sizes.get(evicted, 0) / 1e6:.1f} MB, {reason})")
+            _drop(evicted)
+            metrics.SESSION_CACHE_EVICTIONS.inc(reason=reason)
+        
+        metrics.SESSION_CACHE_BYTES.set(sum(_sizes.values()))
+        metrics.SESSION_CACHE_ENTRIES.set(len(_sessions))
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def stats() -> Dict[str, Any]:
+    """Cache size against its budget, eviction counts and process RSS."""
+    with _lock:
+        entries = len(_sessions)
+        size = sum(_sizes.values())
+        largest = max(_sizes.items(), key=lambda item: item[1], default=None)
+    return {
+        "entries": entries,
+        "max_entries": SESSION_CACHE_SIZE,
+        "bytes": size,
+        "budget_bytes": SESSION_CACHE_BYTES,
+        "largest": {"key": list(largest[0]), "bytes": largest[1]} if largest else None,
+        "evictions": {
+            reason: int(metrics.SESSION_CACHE_EVICTIONS.value(reason=reason)) for reason in ("bytes", "entries")
+        },
+        "process_rss_bytes": _rss_bytes()
+    }
+
+def clear() -> None:
+    """Drop every cached session."""
+    with _lock:
+        _sessions.clear()
+        _sizes.clear()
+        _key_locks.clear()
+        metrics.SESSION_CACHE_BYTES.set(0)
+        metrics.SESSION_CACHE_ENTRIES.set(0)
@@ -0,0 +1,124 @@
+"""Background warm-up of the FastF1 cache and in-process data stores.
+
+Runs in a daemon thread so the API comes up immediately. One pass loads the
+current and previous season schedules, results for every completed round of
+the current season, and for the next few races their previous-year edition
+(results and pace) and the past podiums a briefing looks up. The full
+winners index is built by ``build_winners_index.py`` instead, so warm-up
+does not walk every season. It can also prefetch news for those races. With WARMUP_INTERVAL_SECONDS set, the pass
+repeats on that interval.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from tools import lap_analytics, news_client, schedule_cache, season_store, winners_index
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_INTERVAL = float(os.getenv("WARMUP_INTERVAL_SECONDS", "0"))
+WARMUP_UPCOMING = int(os.getenv("WARMUP_UPCOMING_RACES", "3"))
+NEWS_PREFETCH = os.getenv("NEWS_PREFETCH", "false").lower() == "true"
+# Seasons of past winners to index per upcoming race, as get_circuit_winners is planned with
+WINNERS_YEARS_BACK = 3
+
+_status: Dict[str, Any] = {
+    "state": "idle",
+    "passes": 0,
+    "started_at": None,
+    "finished_at": None,
+    "steps_total": 0,
+    "steps_done": 0,
+    "current": None,
+    "errors": []
+}
+_lock = threading.Lock()
+_thread = None
+
+def _update(**fields) -> None:
+    with _lock:
+        _status.update(fields)
+
+def status() -> Dict[str, Any]:
+    """Snapshot of warm-up progress."""
+    with _lock:
+        return {**_status, "errors": list(_status["errors"][-20:])}
+
+def _plan(year: int) -> List[Tuple[str, Callable[[], Any]]]:
+    """Warm-up steps for a season, built from its (already cached) schedule."""
+    steps: List[Tuple[str, Callable[[], Any]]] = []
+    
+    for _, event in season_store.completed_events(year).iterrows():
+        single = event.to_frame().T
+        steps.append((f"{year} {event['EventName']} results", lambda e=single: season_store.load_rounds(year, e)))
+    
+    schedule = schedule_cache.get_schedule(year)
+    upcoming = schedule[(schedule['RoundNumber'] > 0) & (schedule['EventDate'] >= pd.Timestamp.now().normalize())]
+    for _, event in upcoming.head(WARMUP_UPCOMING).iterrows():
+        def previous_edition(name=event['EventName']):
+            previous = schedule_cache.find_event(year - 1, name)
+            if previous is not None:
+                season_store.get_race_results(year - 1, previous)
+                for session_name in lap_analytics.ANALYSES:
+                    lap_analytics.session_pace(year - 1, name, session_name)
+        steps.append((f"{year - 1} {event['EventName']} results and pace", previous_edition))
+        
+        past_seasons = list(range(year - WINNERS_YEARS_BACK, year))
+        steps.append((f"{event['EventName']} past winners",
+                      lambda name=event['EventName']: winners_index.circuit_podiums(name, past_seasons)))
+    
+    if NEWS_PREFETCH:
+        steps.append(("news for upcoming races", lambda: news_client.prefetch_upcoming(WARMUP_UPCOMING)))
+    
+    return steps
+
+def run_once() -> None:
+    """Run one full warm-up pass, recording progress and per-step errors."""
+    year = datetime.now().year
+    _update(state="running", started_at=time.time(), finished_at=None,
+            steps_total=0, steps_done=0, current="schedules", errors=[])
+    
+    try:
+        schedule_cache.get_schedule(year - 1)
+        schedule_cache.get_schedule(year)
+        steps = _plan(year)
+    except Exception as e:
+        _update(state="failed", current=None, finished_at=time.time(), errors=[f"schedules: {e}"])
+        return
+    
+    _update(steps_total=len(steps))
+    for done, (label, step) in enumerate(steps, start=1):
+        _update(current=label)
+        try:
+            step()
+        except Exception as e:
+            with _lock:
+                _status["errors"].append(f"{label}: {e}")
+        _update(steps_done=done)
+    
+    with _lock:
+        _status.update(state="done", current=None, finished_at=time.time())
+        _status["passes"] += 1
+    print(f"Warm-up pass finished: {len(steps)} steps, {len(_status['errors'])} errors")
+
+def _loop() -> None:
+    while True:
+        run_once()
+        if WARMUP_INTERVAL <= 0:
+            return
+        time.sleep(WARMUP_INTERVAL)
+
+def start() -> bool:
+    """Start the warm-up thread unless disabled or already running."""
+    global _thread
+    if not WARMUP_ENABLED:
+        _update(state="disabled")
+        return False
+    if _thread is not None and _thread.is_alive():
+        return False
+    _thread = threading.Thread(target=_loop, name="warmup", daemon=True)
+    _thread.start()
+    return True
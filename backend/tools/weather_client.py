@@ -0,0 +1,179 @@
+"""Pooled OpenWeather client with geocode and forecast caches.
+
+Circuit coordinates never change, so geocoding results are kept in a JSON
+file next to the FastF1 cache and seeded with every calendar venue. Forecasts
+are cached per location until the next 3-hour forecast step. Point
+OPENWEATHER_BASE_URL at a local stub server to run without the real API.
+
+The HTTP client and geocode lock belong to an event loop, so one of each is
+created lazily per running loop; the CLI, benchmarks and tests that start
+new loops get their own instead of reusing a dead loop's.
+"""
+import asyncio
+import json
+import os
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from tools import fastf1_cache, metrics
+from tools.naming import normalize_name
+
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "http://api.openweathermap.org")
+GEOCODE_CACHE_FILE = os.getenv("GEOCODE_CACHE_FILE", fastf1_cache.cache_path("geocode.json"))
+FORECAST_MAX_TTL = float(os.getenv("FORECAST_TTL_SECONDS", "10800"))
+
+# Circuit coordinates keyed by normalized FastF1 location (and common alternatives)
+VENUE_COORDINATES = {
+    "sakhir": (26.0325, 50.5106),
+    "bahrain": (26.0325, 50.5106),
+    "jeddah": (21.6319, 39.1044),
+    "melbourne": (-37.8497, 144.9680),
+    "suzuka": (34.8431, 136.5407),
+    "shanghai": (31.3389, 121.2197),
+    "miami": (25.9581, -80.2389),
+    "miami gardens": (25.9581, -80.2389),
+    "imola": (44.3439, 11.7167),
+    "monaco": (43.7347, 7.4206),
+    "monte carlo": (43.7347, 7.4206),
+    "montreal": (45.5000, -73.5228),
+    "barcelona": (41.5700, 2.2611),
+    "madrid": (40.4637, -3.6163),
+    "spielberg": (47.2197, 14.7647),
+    "silverstone": (52.0786, -1.0169),
+    "budapest": (47.5789, 19.2486),
+    "spa francorchamps": (50.4372, 5.9714),
+    "spa": (50.4372, 5.9714),
+    "zandvoort": (52.3888, 4.5409),
+    "monza": (45.6156, 9.2811),
+    "baku": (40.3725, 49.8533),
+    "marina bay": (1.2914, 103.8640),
+    "singapore": (1.2914, 103.8640),
+    "austin": (30.1328, -97.6411),
+    "mexico city": (19.4042, -99.0907),
+    "sao paulo": (-23.7036, -46.6997),
+    "las vegas": (36.1147, -115.1728),
+    "lusail": (25.4900, 51.4542),
+    "yas island": (24.4672, 54.6031),
+    "yas marina": (24.4672, 54.6031),
+    "abu dhabi": (24.4672, 54.6031),
+}
+
+_geocodes: Dict[str, Tuple[float, float]] = {}
+_forecasts: Dict[Tuple[float, float], Tuple[Dict[str, Any], float]] = {}
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_geocode_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+def _load_geocodes() -> None:
+    _geocodes.update(VENUE_COORDINATES)
+    try:
+        with open(GEOCODE_CACHE_FILE) as f:
+            _geocodes.update({k: tuple(v) for k, v in json.load(f).items()})
+    except (OSError, ValueError):
+        pass
+
+def _save_geocodes() -> None:
+    learned = {k: v for k, v in _geocodes.items() if VENUE_COORDINATES.get(k) != v}
+    try:
+        os.makedirs(os.path.dirname(GEOCODE_CACHE_FILE) or ".", exist_ok=True)
+        tmp_path = f"{GEOCODE_CACHE_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(learned, f, indent=2)
+        os.replace(tmp_path, GEOCODE_CACHE_FILE)
+    except OSError as e:
+        print(f"Weather client: could not persist geocode cache: {e}")
+
+def get_client() -> httpx.AsyncClient:
+    """Keep-alive client shared within the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            base_url=OPENWEATHER_BASE_URL,
+            timeout=10,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=_transport
+        )
+    return client
+
+def _geocode_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    if loop not in _geocode_locks:
+        _geocode_locks[loop] = asyncio.Lock()
+    return _geocode_locks[loop]
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Route requests through a custom transport (e.g. httpx.MockTransport) and clear cached forecasts."""
+    global _transport
+    _transport = transport
+    _clients.clear()
+    _forecasts.clear()
+
+async def aclose() -> None:
+    """Close the running loop's client."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+def _forecast_expiry(now: float) -> float:
+    """Next 3-hour UTC forecast step, capped at FORECAST_MAX_TTL."""
+    current = datetime.now(timezone.utc)
+    step = current.replace(minute=0, second=0, microsecond=0, hour=current.hour - current.hour % 3)
+    seconds_left = (step + timedelta(hours=3) - current).total_seconds()
+    return now + min(seconds_left, FORECAST_MAX_TTL)
+
+async def get_coordinates(city: str, country_code: str, api_key: str) -> Optional[Tuple[float, float]]:
+    """Latitude/longitude for a city, from the venue seed, the cache file or the API."""
+    if not _geocodes:
+        _load_geocodes()
+    
+    key = normalize_name(city)
+    if key in _geocodes:
+        metrics.cache_hit("geocode")
+        return _geocodes[key]
+    
+    async with _geocode_lock():
+        if key in _geocodes:
+            metrics.cache_hit("geocode")
+            return _geocodes[key]
+        
+        metrics.cache_miss("geocode")
+        response = await get_client().get("/geo/1.0/direct", params={
+            "q": f"{city},{country_code}",
+            "limit": 1,
+            "appid": api_key
+        })
+        if response.status_code != 200 or not response.json():
+            return None
+        
+        location = response.json()[0]
+        _geocodes[key] = (location['lat'], location['lon'])
+        _save_geocodes()
+        return _geocodes[key]
+
+async def get_forecast(lat: float, lon: float, api_key: str) -> Optional[Dict[str, Any]]:
+    """5-day/3-hour forecast for a location, cached until the next forecast step."""
+    key = (round(lat, 2), round(lon, 2))
+    now = time.monotonic()
+    cached = _forecasts.get(key)
+    if cached and cached[1] > now:
+        metrics.cache_hit("forecast")
+        return cached[0]
+    
+    metrics.cache_miss("forecast")
+    response = await get_client().get("/data/2.5/forecast", params={
+        "lat": lat,
+        "lon": lon,
+        "appid": api_key,
+        "units": "metric"
+    })
+    if response.status_code != 200:
+        return None
+    
+    forecast = response.json()
+    _forecasts[key] = (forecast, _forecast_expiry(now))
+    return forecast
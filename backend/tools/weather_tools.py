@@ -1,11 +1,11 @@
 import os
-import requests
 from langchain_core.tools import tool
 from typing import Dict, Any
-from datetime import datetime
+
+from tools import weather_client
 
 @tool
-def get_race_weather(city: str, country_code: str) -> Dict[str, Any]:
+async def get_race_weather(city: str, country_code: str) -> Dict[str, Any]:
     """Get weather forecast for race location using OpenWeather API.
     
     Args:
@@ -20,35 +20,14 @@ def get_race_weather(city: str, country_code: str) -> Dict[str, Any]:
         if not api_key:
             return {"error": "OPENWEATHER_API_KEY not configured"}
         
-        geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct"
-        geo_params = {
-            "q": f"{city},{country_code}",
-            "limit": 1,
-            "appid": api_key
-        }
-        
-        geo_response = requests.get(geocoding_url, params=geo_params, timeout=10)
-        if geo_response.status_code != 200 or not geo_response.json():
+        coordinates = await weather_client.get_coordinates(city, country_code, api_key)
+        if not coordinates:
             return {"error": f"Could not find location for {city}, {country_code}"}
         
-        location = geo_response.json()[0]
-        lat = location['lat']
-        lon = location['lon']
-        
-        forecast_url = "http://api.openweathermap.org/data/2.5/forecast"
-        forecast_params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": api_key,
-            "units": "metric"
-        }
-        
-        forecast_response = requests.get(forecast_url, params=forecast_params, timeout=10)
-        if forecast_response.status_code != 200:
+        forecast_data = await weather_client.get_forecast(coordinates[0], coordinates[1], api_key)
+        if forecast_data is None:
             return {"error": "Failed to fetch weather forecast"}
         
-        forecast_data = forecast_response.json()
-        
         forecasts = []
         for item in forecast_data.get('list', [])[:8]:
             forecasts.append({
@@ -0,0 +1,212 @@
+"""On-disk index of race podiums across seasons.
+
+Every indexed Grand Prix contributes its top three finishers to one SQLite
+table, keyed by (year, round, position) and indexed by normalized event
+name and location. Looking up a circuit's winners for any number of seasons
+is then a single query, whatever ``years_back`` is. Rounds are added
+incrementally: on demand for the events a lookup needs (the background
+warm-up looks up the upcoming races), and for whole seasons by
+``build_winners_index.py``. A season is marked complete once its
+final round has been indexed and is never revisited.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from tools import fastf1_cache, schedule_cache, session_loader
+from tools.naming import normalize_name
+
+WINNERS_INDEX_FILE = os.getenv("WINNERS_INDEX_FILE", fastf1_cache.cache_path("winners.sqlite"))
+WINNERS_FIRST_SEASON = int(os.getenv("WINNERS_FIRST_SEASON", "2018"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS podiums (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    event_name TEXT NOT NULL,
+    event_key TEXT NOT NULL,
+    location_key TEXT NOT NULL,
+    driver TEXT,
+    driver_code TEXT,
+    team TEXT,
+    time TEXT,
+    PRIMARY KEY (year, round, position)
+);
+CREATE INDEX IF NOT EXISTS podiums_event ON podiums (event_key, year);
+CREATE INDEX IF NOT EXISTS podiums_location ON podiums (location_key, year);
+CREATE TABLE IF NOT EXISTS indexed_rounds (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    PRIMARY KEY (year, round)
+);
+CREATE TABLE IF NOT EXISTS complete_seasons (
+    year INTEGER PRIMARY KEY
+);
+"""
+
+_initialized = False
+
+def _connect() -> sqlite3.Connection:
+    global _initialized
+    os.makedirs(os.path.dirname(WINNERS_INDEX_FILE) or ".", exist_ok=True)
+    conn = sqlite3.connect(WINNERS_INDEX_FILE, timeout=30)
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _initialized = True
+    return conn
+
+def _indexed_rounds(conn: sqlite3.Connection, year: int) -> set:
+    return {r for (r,) in conn.execute("SELECT round FROM indexed_rounds WHERE year = ?", (year,))}
+
+def _podium_rows(year: int, event: pd.Series) -> List[tuple]:
+    session = session_loader.load_session(year, int(event['RoundNumber']), 'R', profile="results")
+    results = session.results.copy()
+    results['Position'] = pd.to_numeric(results['Position'], errors='coerce')
+    podium = results[results['Position'].between(1, 3)].sort_values('Position')
+    return [
+        (
+            year,
+            int(event['RoundNumber']),
+            int(row['Position']),
+            event['EventName'],
+            normalize_name(event['EventName']),
+            normalize_name(event['Location']),
+            row.get('FullName'),
+            row.get('Abbreviation'),
+            row.get('TeamName'),
+            str(row['Time']) if pd.notna(row.get('Time')) else None
+        )
+        for _, row in podium.iterrows()
+    ]
+
+def index_events(year: int, events: pd.DataFrame) -> None:
+    """Add the podiums of the given (completed) schedule rows, skipping indexed rounds.
+    
+    Rounds whose session fails to load or has no podium yet (results not
+    published) are logged and left for a later attempt. Sessions load
+    outside any transaction; concurrent writers of the same round insert
+    identical rows, so no extra locking is needed.
+    """
+    with closing(_connect()) as conn:
+        done = _indexed_rounds(conn, year)
+        for _, event in events.iterrows():
+            round_number = int(event['RoundNumber'])
+            if round_number in done:
+                continue
+            try:
+                rows = _podium_rows(year, event)
+            except Exception as e:
+                print(f"Winners index: skipped {year} round {round_number}: {e}")
+                continue
+            if not rows:
+                print(f"Winners index: no podium for {year} round {round_number} yet")
+                continue
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO podiums VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("INSERT OR IGNORE INTO indexed_rounds VALUES (?, ?)", (year, round_number))
+            done.add(round_number)
+
+def index_season(year: int) -> None:
+    """Index every completed round of a season; mark it complete once the final round is in."""
+    with closing(_connect()) as conn:
+        if conn.execute("SELECT 1 FROM complete_seasons WHERE year = ?", (year,)).fetchone():
+            return
+    
+    schedule = schedule_cache.get_schedule(year)
+    rounds = schedule[schedule['RoundNumber'] > 0]
+    completed = rounds[schedule_cache.race_over(rounds)]
+    index_events(year, completed)
+    
+    with closing(_connect()) as conn:
+        indexed = _indexed_rounds(conn, year)
+        if len(completed) == len(rounds) and set(rounds['RoundNumber'].astype(int)) <= indexed:
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO complete_seasons VALUES (?)", (year,))
+
+def build(years: Optional[Iterable[int]] = None) -> None:
+    """Index all seasons from WINNERS_FIRST_SEASON through the current one."""
+    for year in years or range(WINNERS_FIRST_SEASON, datetime.now().year + 1):
+        try:
+            index_season(year)
+        except Exception as e:
+            print(f"Winners index: could not index {year}: {e}")
+
+def _ensure_event(circuit_name: str, years: List[int]) -> None:
+    """Index just the matching event of each incomplete season in ``years``."""
+    with closing(_connect()) as conn:
+        placeholders = ",".join("?" * len(years))
+        complete = {y for (y,) in conn.execute(
+            f"SELECT year FROM complete_seasons WHERE year IN ({placeholders})", years)}
+    
+    for year in years:
+        if year in complete:
+            continue
+        try:
+            event = schedule_cache.find_event(year, circuit_name)
+        except Exception as e:
+            print(f"Winners index: no {year} schedule for {circuit_name!r}: {e}")
+            continue
+        if event is None or int(event['RoundNumber']) <= 0:
+            continue
+        events = event.to_frame().T
+        if schedule_cache.race_over(events).iloc[0]:
+            index_events(year, events)
+
+def _target(circuit_name: str, years: List[int]) -> Optional[pd.Series]:
+    """The event a circuit name refers to, taken from the latest season that knows it."""
+    for year in sorted(years, reverse=True):
+        try:
+            event = schedule_cache.find_event(year, circuit_name)
+        except Exception:
+            continue
+        if event is not None and int(event['RoundNumber']) > 0:
+            return event
+    return None
+
+def circuit_podiums(circuit_name: str, years: List[int]) -> pd.DataFrame:
+    """Podium rows for a circuit's race in each of ``years`` (at most one race per year).
+    
+    Races are matched by event name, falling back to the event's location for
+    seasons where the race ran under another name (e.g. Mexican / Mexico City).
+    """
+    columns = ['year', 'round', 'position', 'event_name', 'driver', 'driver_code', 'team', 'time']
+    if not years:
+        return pd.DataFrame(columns=columns)
+    
+    target = _target(circuit_name, years)
+    if target is None:
+        return pd.DataFrame(columns=columns)
+    
+    _ensure_event(circuit_name, years)
+    event_key = normalize_name(target['EventName'])
+    location_key = normalize_name(target['Location'])
+    
+    with closing(_connect()) as conn:
+        frame = pd.read_sql_query(
+            """
+            SELECT year, round, position, event_name, driver, driver_code, team, time,
+                   event_key = :event AS exact
+            FROM podiums
+            WHERE (event_key = :event OR location_key = :location) AND year BETWEEN :first AND :last
+            ORDER BY year DESC, exact DESC, round, position
+            """,
+            conn,
+            params={"event": event_key, "location": location_key, "first": min(years), "last": max(years)}
+        )
+    
+    # One race per season: the exact name match if there is one
+    first_round = frame.groupby('year')['round'].transform('first')
+    return frame[frame['round'] == first_round][columns].reset_index(drop=True)
+
+def stats() -> Dict[str, int]:
+    with closing(_connect()) as conn:
+        return {
+            "rounds": conn.execute("SELECT COUNT(*) FROM indexed_rounds").fetchone()[0],
+            "complete_seasons": conn.execute("SELECT COUNT(*) FROM complete_seasons").fetchone()[0]
+        }
@@ -44,6 +44,7 @@ export default function BriefingChat() {
       if (useStreaming) {
         const stream = streamBriefing(searchTerm);
         const tools: ToolResult[] = [];
+        let streamedBriefing = '';
 
         for await (const event of stream) {
           if (event.type === 'status') {
@@ -56,6 +57,9 @@ export default function BriefingChat() {
               success: event.data.success,
             });
             setToolTrace([...tools]);
+          } else if (event.type === 'briefing_delta') {
+            streamedBriefing += event.data.delta;
+            setBriefing(streamedBriefing);
           } else if (event.type === 'briefing') {
             setBriefing(event.data.content);
             setStatusMessage('');
@@ -46,7 +46,7 @@ export async function getRaces(year: number): Promise<Race[]> {
 }
 
 export interface StreamEvent {
-  type: 'status' | 'race_info' | 'tool_result' | 'briefing' | 'complete' | 'error';
+  type: 'status' | 'race_info' | 'tool_result' | 'briefing_delta' | 'briefing' | 'complete' | 'error';
   data: any;
 }
 
@@ -97,7 +97,9 @@ export async function* streamBriefing(query: string): AsyncGenerator<StreamEvent
           try {
             const data = JSON.parse(dataStr);
             
-            if (data.step) {
+            if (data.delta !== undefined) {
+              yield { type: 'briefing_delta', data };
+            } else if (data.step) {
               yield { type: 'status', data };
             } else if (data.name) {
               yield { type: 'race_info', data };